@@ -115,6 +115,13 @@ def main():
     """Main entry point."""
     if sys.platform.startswith('win'):
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    else:
+        # uvloop (optional) cuts per-await overhead of the event loop
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     
     logger.info("=" * 70)
     logger.info("🚀 ENTERPRISE SCRAPER - SELF-HEALING MODE")
@@ -7,11 +7,16 @@ for e-commerce data extraction. Provides highest accuracy with minimal parsing.
 
 import json
 import logging
+import re
 from typing import Dict, Any, Optional, List
 from playwright.async_api import Page
 
 logger = logging.getLogger("JSONLDExtractor")
 
+# Thousands separators (ASCII comma, Arabic thousands separator, spaces)
+_PRICE_SEPARATORS = str.maketrans('', '', ',\u066c \u00a0')
+_NON_NUMERIC_RE = re.compile(r'[^\d.]')
+
 
 class JSONLDExtractor:
     """
@@ -91,12 +96,11 @@ class JSONLDExtractor:
     def _is_product(obj: Dict[str, Any]) -> bool:
         """Check if object is a Product schema."""
         type_field = obj.get('@type', '')
+        if type_field == 'Product':
+            return True
         
         # Handle array of types
-        if isinstance(type_field, list):
-            return 'Product' in type_field
-        
-        return type_field == 'Product'
+        return type(type_field) is list and 'Product' in type_field
     
     @staticmethod
     def extract_product_data(product_schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -178,19 +182,27 @@ class JSONLDExtractor:
     @staticmethod
     def _extract_price(offer: Dict[str, Any]) -> float:
         """Extract numeric price from offer object."""
-        price_str = offer.get('price', 0)
+        price = offer.get('price', 0)
+        price_type = type(price)
+        
+        # Numeric prices need no parsing
+        if price_type is int or price_type is float:
+            return float(price)
         
         # Handle string prices
-        if isinstance(price_str, str):
-            # Remove non-numeric characters
-            import re
-            price_str = re.sub(r'[^\d.]', '', price_str)
+        if price_type is str:
+            # Fast path: digits with thousands separators, e.g. "129,000"
+            cleaned = price.translate(_PRICE_SEPARATORS)
+            if cleaned.replace('.', '', 1).isdigit():
+                return float(cleaned)
+            
+            # Remove non-numeric characters (currency symbols, words, ...)
             try:
-                return float(price_str)
+                return float(_NON_NUMERIC_RE.sub('', price))
             except ValueError:
                 return 0.0
         
-        return float(price_str)
+        return float(price)
     
     @staticmethod
     async def extract_from_page(page: Page) -> Optional[Dict[str, Any]]:
@@ -25,14 +25,15 @@ from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from config_manager import get_config
 from config_db import DatabaseCore
 # from proxy_guard import ProxyManager  # Temporarily disabled - requires aiohttp
-from site_handlers import get_handler_for_url
+from site_handlers import get_handler_for_url, install_resource_blocker
 from resilience.adaptive_throttle import get_adaptive_throttler
+from url_utils import domain_of
 from concurrent_engine import DomainRateLimiter, CircuitBreaker
 from captcha_detector import CAPTCHADetector
 
 # Stealth imports
 from stealth.tls_spoofer import TLSSpoofingManager
-from stealth.canvas_noise import CanvasNoiseInjector
+from stealth.canvas_noise import get_stealth_injector
 from stealth.human_input import get_human_mouse, get_human_typing
 
 # Logging Setup
@@ -76,7 +77,7 @@ class BrowserWorker:
     
     def __init__(self, config):
         self.config = config
-        self.canvas_injector = CanvasNoiseInjector()
+        self.stealth_injector = get_stealth_injector()
         self.human_mouse = get_human_mouse()
         self.human_typing = get_human_typing()
         self.captcha_detector = CAPTCHADetector()
@@ -90,6 +91,18 @@ class BrowserWorker:
         }
         self.error_dir = config.get('system.paths.error_screenshots', default="data/errors")
         Path(self.error_dir).mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def _response_time(response) -> Optional[float]:
+        """
+        Seconds from sending the document request to its first response byte.
+        
+        Excludes browser launch, rendering and page interaction, so it only
+        reflects how fast the server answered. None if Playwright has no timing.
+        """
+        timing = response.request.timing
+        response_start = timing.get('responseStart', -1) if timing else -1
+        return response_start / 1000.0 if response_start >= 0 else None
 
     async def run(self, url: str, proxy: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
@@ -117,20 +130,13 @@ class BrowserWorker:
                 )
 
                 # ---------------------------------------------------------
-                # STEALTH: Inject Canvas/WebGL Noise
+                # STEALTH: Inject Canvas/Font/WebGL Noise (once per context)
                 # ---------------------------------------------------------
-                page: Page = await context.new_page()
-                await self.canvas_injector.inject(page)
+                await self.stealth_injector.inject_context(context)
                 
-                # Block media for performance
-                await context.route(
-                    "**/*",
-                    lambda route: (
-                        route.abort()
-                        if route.request.resource_type in ["image", "media"]
-                        else route.continue_()
-                    ),
-                )
+                # Block media, fonts, CSS and trackers for performance
+                await install_resource_blocker(context)
+                page: Page = await context.new_page()
 
                 logger.info("loading_page", url=url)
 
@@ -180,15 +186,18 @@ class BrowserWorker:
                     await self.human_mouse.move_to(page, 500, 500)
                     
                     # Get handler
-                    handler_class = await get_handler_for_url(url)
-                    logger.info("using_handler", handler=handler_class.__name__)
+                    handler = get_handler_for_url(url)
+                    logger.info("using_handler", handler=handler.name)
                     
                     # Extract
-                    result = await handler_class.extract_price(page, url)
+                    result = await handler.extract_price(page, url)
                     
                     # Add metadata
                     result['score'] = 100.0
-                    result['meta'] = {'handler': handler_class.__name__}
+                    result['meta'] = {
+                        'handler': handler.name,
+                        'response_time': self._response_time(response)
+                    }
                     
                     return result
 
@@ -307,6 +316,17 @@ class ScraperOrchestrator:
                 logger.warning("circuit_breaker_open", url=task.url)
                 await self.db.log_failure(task.id, "Circuit Breaker Open")
                 return
+            
+            # A recent extraction of the same product needs no browser,
+            # navigation or per-domain delay
+            handler = get_handler_for_url(task.url)
+            cached = handler.get_cached_result(task.url)
+            if cached is not None:
+                cached['score'] = 100.0
+                cached['meta'] = {'handler': handler.name}
+                await self.db.save_success(task.id, cached)
+                logger.info("task_success_cached", url=task.url, price=cached.get('price', 0))
+                return
 
             # Domain Rate Limiting
             await self.domain_limiter.acquire(task.url)
@@ -314,8 +334,9 @@ class ScraperOrchestrator:
             logger.info("processing_task", url=task.url, id=task.id)
             
             try:
-                # Apply adaptive throttling (sleep)
-                self.throttler.sleep(task.url)
+                # Apply adaptive throttling (sleep); later updates reuse the domain
+                domain = domain_of(task.url)
+                self.throttler.sleep(domain)
                 
                 # Execute with retry logic
                 result = await self.process_task_with_retry(task.url)
@@ -324,13 +345,16 @@ class ScraperOrchestrator:
                      await self.db.log_failure(task.id, "404 Not Found")
                 else:
                     await self.db.save_success(task.id, result)
-                    self.throttler.record_success(task.url)
+                    # Only the server's response time drives the latency
+                    # controller; None falls back to the success streak
+                    latency = result.get('meta', {}).get('response_time')
+                    self.throttler.record_success(domain, latency=latency)
                     logger.info("task_success", title=result.get('title', 'Unknown'), price=result.get('price', 0))
                 
             except Exception as e:
                 logger.error("task_failed", error=str(e))
                 await self.db.log_failure(task.id, str(e))
-                self.throttler.record_failure(task.url)
+                self.throttler.record_failure(domain_of(task.url))
                 self.circuit_breaker.record_failure(task.url)
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10), retry=retry_if_exception_type(RetryableException))
@@ -355,6 +379,13 @@ class ScraperOrchestrator:
 if __name__ == "__main__":
     if sys.platform.startswith('win'):
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    else:
+        # uvloop (optional) cuts per-await overhead of the event loop
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
         
     orchestrator = ScraperOrchestrator()
     asyncio.run(orchestrator.run())
@@ -6,7 +6,9 @@ to dynamically adjust request delays based on server response times and errors.
 
 Features:
 - Automatic delay adjustment based on success/failure
-- Per-domain throttling state
+- Latency-driven control: EWMA of response times steers the delay
+  towards a target latency when callers report timings
+- Per-domain throttling state that decays back to the base delay when idle
 - Hot-reloadable configuration
 - Thread-safe state management
 
@@ -16,11 +18,12 @@ FIXED (Second-Pass Audit):
 """
 
 import logging
+import math
 import time
 import threading
 import asyncio
-from typing import Dict, Optional
-from urllib.parse import urlparse
+from typing import Dict, Optional, Tuple
+from url_utils import domain_of
 from config_manager import get_config
 
 logger = logging.getLogger(__name__)
@@ -30,12 +33,17 @@ class AdaptiveThrottler:
     Manages dynamic delays for scraping requests using AIMD algorithm.
     
     Logic:
-    - On Success: Decrease delay linearly (Additive Decrease)
-    - On Failure (429/5xx): Increase delay exponentially (Multiplicative Increase)
+    - On Success with latency: Track an EWMA of response time and nudge the
+      delay by latency_gain * (ewma - target_latency)
+    - On Success without latency: Decrease delay linearly (Additive Decrease)
+    - On Failure (429/5xx): Increase delay exponentially (Multiplicative Increase),
+      at least doubling on 429
     - Respects min/max delay bounds from config
     
     Thread Safety:
     - Uses threading.Lock for synchronous update protection
+    - Reads are lock-free: each domain's (delay, timestamp) pair is
+      replaced as one immutable tuple, never mutated in place
     - Safe for use from both sync and async contexts
     - Lock holds are brief (dictionary updates only)
     """
@@ -49,8 +57,10 @@ class AdaptiveThrottler:
         # 3. Called from both sync and async code
         # If performance issues arise, consider asyncio.Lock for async-only paths
         self._lock = threading.Lock()
-        self._domain_delays: Dict[str, float] = {}
+        # domain -> (delay, monotonic timestamp of the last update)
+        self._domain_delays: Dict[str, Tuple[float, float]] = {}
         self._success_counts: Dict[str, int] = {}
+        self._ewma_latency: Dict[str, float] = {}
         
         # Load initial config
         self._load_config()
@@ -75,6 +85,17 @@ class AdaptiveThrottler:
         self.decrease_factor = float(adaptive_config.get('decrease_factor', 0.5))
         self.success_threshold = int(adaptive_config.get('success_threshold', 5))
         
+        # Latency control (used when record_success() is given a latency)
+        self.target_latency = float(adaptive_config.get('target_latency', 1.0))
+        self.latency_gain = float(adaptive_config.get('latency_gain', 0.5))
+        self.ewma_weight = float(adaptive_config.get('ewma_weight', 0.5))
+        
+        # Largest delay change a single success may cause
+        self.max_delta = float(adaptive_config.get('max_delta', 0.1))
+        
+        # Per-second rate at which an idle domain's delay relaxes to base_delay
+        self.decay_rate = float(adaptive_config.get('decay_rate', 0.01))
+        
         logger.debug(f"Adaptive Throttler loaded: Enabled={self.enabled}, Base={self.base_delay}s")
 
     def _on_config_change(self, old_config, new_config):
@@ -83,19 +104,42 @@ class AdaptiveThrottler:
         self._load_config()
 
     def _get_domain(self, url: str) -> str:
-        """Extract domain from URL with error handling."""
+        """
+        Resolve the throttling key for a URL or an already-extracted domain.
+        
+        Bare domains (no scheme) skip URL parsing and are only lowercased,
+        so they share state with URLs resolved through domain_of().
+        """
+        if '://' not in url:
+            return url.lower()
         try:
-            return urlparse(url).netloc
+            return domain_of(url)
         except Exception as e:
             logger.warning(f"Failed to parse URL domain: {url}, error: {e}")
             return "unknown"
 
+    def _clip_delay(self, current_delay: float, new_delay: float) -> float:
+        """Limit a latency-driven update to +/- max_delta and the delay bounds."""
+        delta = min(self.max_delta, max(-self.max_delta, new_delay - current_delay))
+        return min(self.max_delay, max(self.min_delay, current_delay + delta))
+
+    def _current_delay(self, domain: str, now: float) -> float:
+        """Delay for a domain with idle-time decay towards base_delay applied."""
+        entry = self._domain_delays.get(domain)
+        if entry is None:
+            return self.base_delay
+        
+        delay, last_ts = entry
+        if self.decay_rate <= 0:
+            return delay
+        return self.base_delay + (delay - self.base_delay) * math.exp(-self.decay_rate * (now - last_ts))
+
     def get_delay(self, url: str) -> float:
         """
         Get the current required delay for a URL.
         
         Args:
-            url: The target URL
+            url: The target URL or its domain
             
         Returns:
             Float delay in seconds
@@ -104,16 +148,16 @@ class AdaptiveThrottler:
             return self.base_delay
             
         domain = self._get_domain(url)
-        
-        with self._lock:
-            return self._domain_delays.get(domain, self.base_delay)
+        return self._current_delay(domain, time.monotonic())
 
-    def record_success(self, url: str):
+    def record_success(self, url: str, latency: Optional[float] = None):
         """
         Record a successful request and potentially decrease delay.
         
         Args:
-            url: The target URL
+            url: The target URL or its domain
+            latency: Observed response time in seconds (optional). When given,
+                the delay follows the latency EWMA instead of the success streak.
         """
         if not self.enabled:
             return
@@ -121,23 +165,40 @@ class AdaptiveThrottler:
         domain = self._get_domain(url)
         
         with self._lock:
-            # Initialize if missing
-            if domain not in self._domain_delays:
-                self._domain_delays[domain] = self.base_delay
-                self._success_counts[domain] = 0
+            now = time.monotonic()
+            current_delay = self._current_delay(domain, now)
+            
+            if latency is not None:
+                # Weight the newest response against the running average
+                ewma = self._ewma_latency.get(domain, latency)
+                ewma = self.ewma_weight * latency + (1.0 - self.ewma_weight) * ewma
+                self._ewma_latency[domain] = ewma
+                
+                # Slow responses push the delay up, fast ones probe lower delays
+                new_delay = self._clip_delay(
+                    current_delay,
+                    current_delay + self.latency_gain * (ewma - self.target_latency)
+                )
+                
+                if new_delay != current_delay:
+                    logger.debug(
+                        f"⚖️  Latency-adjusted delay for {domain}: {current_delay:.2f}s -> {new_delay:.2f}s "
+                        f"(EWMA {ewma:.2f}s, target {self.target_latency:.2f}s)"
+                    )
+                    self._domain_delays[domain] = (new_delay, now)
+                return
             
             # Increment success streak
-            self._success_counts[domain] += 1
+            self._success_counts[domain] = self._success_counts.get(domain, 0) + 1
             
             # Check if we should decrease delay
             if self._success_counts[domain] >= self.success_threshold:
-                current_delay = self._domain_delays[domain]
-                # Additive Decrease
+                # Additive Decrease (decrease_factor is its own step bound)
                 new_delay = max(self.min_delay, current_delay - self.decrease_factor)
                 
                 if new_delay < current_delay:
                     logger.debug(f"📉 Decreasing delay for {domain}: {current_delay:.2f}s -> {new_delay:.2f}s")
-                    self._domain_delays[domain] = new_delay
+                    self._domain_delays[domain] = (new_delay, now)
                     self._success_counts[domain] = 0  # Reset counter
 
     def record_failure(self, url: str, status_code: Optional[int] = None):
@@ -145,7 +206,7 @@ class AdaptiveThrottler:
         Record a failed request and increase delay.
         
         Args:
-            url: The target URL
+            url: The target URL or its domain
             status_code: HTTP status code (optional)
         """
         if not self.enabled:
@@ -165,18 +226,18 @@ class AdaptiveThrottler:
             return
 
         with self._lock:
-            # Initialize if missing
-            if domain not in self._domain_delays:
-                self._domain_delays[domain] = self.base_delay
-            
-            current_delay = self._domain_delays[domain]
+            now = time.monotonic()
+            current_delay = self._current_delay(domain, now)
             
-            # Multiplicative Increase
-            new_delay = min(self.max_delay, current_delay * self.increase_factor)
+            # Multiplicative Increase (rate limits always back off at least 2x)
+            factor = self.increase_factor
+            if status_code == 429:
+                factor = max(factor, 2.0)
+            new_delay = min(self.max_delay, current_delay * factor)
             
             if new_delay > current_delay:
                 logger.warning(f"📈 Throttling {domain}: {current_delay:.2f}s -> {new_delay:.2f}s (Status: {status_code})")
-                self._domain_delays[domain] = new_delay
+                self._domain_delays[domain] = (new_delay, now)
                 self._success_counts[domain] = 0  # Reset success streak
 
     def sleep(self, url: str):
@@ -184,7 +245,7 @@ class AdaptiveThrottler:
         Sleep for the calculated delay period.
         
         Args:
-            url: The target URL
+            url: The target URL or its domain
         """
         delay = self.get_delay(url)
         if delay > 0:
@@ -195,7 +256,7 @@ class AdaptiveThrottler:
         Async version of sleep for async contexts.
         
         Args:
-            url: The target URL
+            url: The target URL or its domain
         """
         delay = self.get_delay(url)
         if delay > 0:
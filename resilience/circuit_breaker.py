@@ -18,14 +18,30 @@ Features:
 
 import logging
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Tuple
 import time
+from url_utils import domain_of
 import redis
 from config_manager import get_config
 
 logger = logging.getLogger(__name__)
 
 
+# Atomic failure transition used by record_many():
+# INCR failures and age them out after the failure window (as
+# record_failure() does), stamp last_failure, and open the circuit once the
+# threshold is reached. Returns the new failure count.
+_RECORD_FAILURE_LUA = """
+local failures = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+redis.call('SET', KEYS[2], ARGV[1])
+if failures >= tonumber(ARGV[2]) then
+    redis.call('SET', KEYS[3], ARGV[3], 'EX', tonumber(ARGV[4]))
+end
+return failures
+"""
+
+
 class CircuitState(Enum):
     """Circuit breaker states."""
     CLOSED = "closed"          # Normal operation
@@ -51,10 +67,16 @@ class DomainCircuitBreaker:
         self.failure_threshold = self.config.get('scraper.circuit_breaker.failure_threshold', default=5)
         self.cooldown_period = self.config.get('scraper.circuit_breaker.cooldown_period', default=300)  # 5 minutes
         self.half_open_max_calls = self.config.get('scraper.circuit_breaker.half_open_max_calls', default=3)
+        self.failure_window = self.config.get('scraper.circuit_breaker.failure_window', default=600)  # 10 minutes
+        self.state_cache_ttl = self.config.get('scraper.circuit_breaker.state_cache_ttl', default=0.5)
+        
+        # domain -> (CircuitState, monotonic expiry); saves a Redis read per request
+        self._state_cache = {}
         
         # Connect to Redis
         redis_url = self.config.get('databases.redis.url', default='redis://localhost:6379/0')
         self.redis_client = redis.from_url(redis_url, decode_responses=True)
+        self._record_failure_script = self.redis_client.register_script(_RECORD_FAILURE_LUA)
         
         logger.info(f"Circuit Breaker initialized: {'Enabled' if self.enabled else 'Disabled'}")
         logger.info(f"  Failure Threshold: {self.failure_threshold}")
@@ -62,9 +84,7 @@ class DomainCircuitBreaker:
     
     def _get_domain(self, url: str) -> str:
         """Extract domain from URL."""
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        return parsed.netloc
+        return domain_of(url)
     
     def _get_state_key(self, domain: str) -> str:
         """Get Redis key for circuit state."""
@@ -96,15 +116,24 @@ class DomainCircuitBreaker:
             return CircuitState.CLOSED
         
         domain = self._get_domain(url)
-        state_key = self._get_state_key(domain)
         
-        state_str = self.redis_client.get(state_key)
+        cached = self._state_cache.get(domain)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        
+        state = self._read_state(domain)
+        self._state_cache[domain] = (state, time.monotonic() + self.state_cache_ttl)
+        return state
+    
+    def _read_state(self, domain: str) -> CircuitState:
+        """Read circuit state and last failure time from Redis in one round-trip."""
+        state_str, last_failure_time = self.redis_client.mget(
+            self._get_state_key(domain),
+            self._get_last_failure_key(domain)
+        )
         
         if state_str == CircuitState.OPEN.value:
             # Check if cooldown period elapsed
-            last_failure_key = self._get_last_failure_key(domain)
-            last_failure_time = self.redis_client.get(last_failure_key)
-            
             if last_failure_time:
                 elapsed = time.time() - float(last_failure_time)
                 
@@ -127,6 +156,7 @@ class DomainCircuitBreaker:
         """Set circuit state in Redis."""
         state_key = self._get_state_key(domain)
         self.redis_client.set(state_key, state.value)
+        self._state_cache.pop(domain, None)
     
     def is_allowed(self, url: str) -> bool:
         """
@@ -138,6 +168,9 @@ class DomainCircuitBreaker:
         Returns:
             True if request allowed, False if circuit is open
         """
+        if not self.enabled:
+            return True
+        
         state = self.get_state(url)
         
         if state == CircuitState.OPEN:
@@ -206,29 +239,87 @@ class DomainCircuitBreaker:
         domain = self._get_domain(url)
         failures_key = self._get_failures_key(domain)
         
-        # Increment failure count
-        failures = self.redis_client.incr(failures_key)
-        
-        # Record timestamp
-        last_failure_key = self._get_last_failure_key(domain)
-        self.redis_client.set(last_failure_key, str(time.time()))
+        # Count, age out and timestamp the failure in a single round-trip
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.incr(failures_key)
+        pipe.expire(failures_key, self.failure_window)
+        pipe.set(self._get_last_failure_key(domain), str(time.time()))
+        failures = pipe.execute()[0]
         
         logger.warning(f"❌ Failure recorded for {domain}: {failures}/{self.failure_threshold}")
         
         # Check if threshold exceeded
         if failures >= self.failure_threshold:
-            # Open circuit
-            self._set_state(domain, CircuitState.OPEN)
-            
-            # Set expiration for automatic recovery
+            # Open circuit with expiration for automatic recovery
             state_key = self._get_state_key(domain)
-            self.redis_client.expire(state_key, self.cooldown_period)
+            self.redis_client.set(state_key, CircuitState.OPEN.value, ex=self.cooldown_period)
+            self._state_cache.pop(domain, None)
             
             logger.error(
                 f"🚨 Circuit OPEN for {domain} after {failures} failures "
                 f"(cooldown: {self.cooldown_period}s)"
             )
     
+    def record_many(self, results: List[Tuple[str, bool]]):
+        """
+        Record the outcome of a batch of requests in a single round-trip.
+        
+        Queues every success/failure update on one non-transactional
+        pipeline instead of issuing separate commands per URL.
+        
+        Args:
+            results: List of (url, success) tuples
+        """
+        if not self.enabled or not results:
+            return
+        
+        pipe = self.redis_client.pipeline(transaction=False)
+        failed_domains = []
+        now = str(time.time())
+        
+        for url, success in results:
+            domain = self._get_domain(url)
+            self._state_cache.pop(domain, None)
+            
+            if success:
+                # Deleting the state key is equivalent to CLOSED
+                pipe.delete(
+                    self._get_failures_key(domain),
+                    self._get_state_key(domain),
+                    self._get_half_open_calls_key(domain)
+                )
+            else:
+                self._record_failure_script(
+                    keys=[
+                        self._get_failures_key(domain),
+                        self._get_last_failure_key(domain),
+                        self._get_state_key(domain)
+                    ],
+                    args=[
+                        now, self.failure_threshold, CircuitState.OPEN.value,
+                        self.cooldown_period, self.failure_window
+                    ],
+                    client=pipe
+                )
+                failed_domains.append(domain)
+        
+        replies = pipe.execute()
+        
+        # Failure scripts return their counts; success deletes return key counts
+        failure_counts = [
+            reply for (url, success), reply in zip(results, replies) if not success
+        ]
+        for domain, failures in zip(failed_domains, failure_counts):
+            if failures >= self.failure_threshold:
+                logger.error(
+                    f"🚨 Circuit OPEN for {domain} after {failures} failures "
+                    f"(cooldown: {self.cooldown_period}s)"
+                )
+            else:
+                logger.warning(f"❌ Failure recorded for {domain}: {failures}/{self.failure_threshold}")
+        
+        logger.debug(f"Recorded {len(results)} circuit breaker results in one pipeline")
+    
     def get_stats(self, url: str) -> dict:
         """
         Get circuit breaker statistics for domain.
@@ -241,6 +332,16 @@ class DomainCircuitBreaker:
         """
         domain = self._get_domain(url)
         
+        if not self.enabled:
+            return {
+                'domain': domain,
+                'state': CircuitState.CLOSED.value,
+                'failures': 0,
+                'threshold': self.failure_threshold,
+                'cooldown_period': self.cooldown_period,
+                'is_allowed': True
+            }
+        
         failures_key = self._get_failures_key(domain)
         failures = int(self.redis_client.get(failures_key) or 0)
         
@@ -271,16 +372,59 @@ class DomainCircuitBreaker:
             self._get_last_failure_key(domain),
             self._get_half_open_calls_key(domain)
         )
+        self._state_cache.pop(domain, None)
         
         logger.info(f"🔄 Circuit manually reset for {domain}")
 
 
+class _NoopCircuitBreaker:
+    """
+    Pass-through breaker used when the circuit breaker is disabled.
+    
+    Every request is allowed and nothing touches Redis.
+    """
+    
+    enabled = False
+    
+    def get_state(self, url: str) -> CircuitState:
+        return CircuitState.CLOSED
+    
+    def is_allowed(self, url: str) -> bool:
+        return True
+    
+    def record_success(self, url: str):
+        pass
+    
+    def record_failure(self, url: str, error: Optional[str] = None):
+        pass
+    
+    def record_many(self, results: List[Tuple[str, bool]]):
+        pass
+    
+    def get_stats(self, url: str) -> dict:
+        return {
+            'domain': domain_of(url),
+            'state': CircuitState.CLOSED.value,
+            'failures': 0,
+            'threshold': None,
+            'cooldown_period': None,
+            'is_allowed': True
+        }
+    
+    def reset(self, url: str):
+        pass
+
+
 # Singleton instance
 _circuit_breaker = None
 
 def get_circuit_breaker() -> DomainCircuitBreaker:
-    """Get singleton circuit breaker instance."""
+    """Get singleton circuit breaker instance (no-op stub when disabled)."""
     global _circuit_breaker
     if _circuit_breaker is None:
-        _circuit_breaker = DomainCircuitBreaker()
+        if get_config().get('scraper.circuit_breaker.enabled', default=True):
+            _circuit_breaker = DomainCircuitBreaker()
+        else:
+            logger.info("Circuit Breaker disabled - using pass-through stub")
+            _circuit_breaker = _NoopCircuitBreaker()
     return _circuit_breaker
@@ -5,15 +5,49 @@ Tracks and analyzes server response times for performance optimization.
 """
 
 import logging
-import time
 from typing import Dict, List
-from collections import defaultdict, deque
-from statistics import mean, median
-from datetime import datetime
+from collections import defaultdict
+import numpy as np
 
 logger = logging.getLogger("ResponseAnalytics")
 
 
+class RingBuffer:
+    """
+    Fixed-size per-domain sample store.
+    
+    Keeps response times and status codes in parallel preallocated
+    NumPy arrays instead of one dict per sample.
+    """
+    
+    def __init__(self, size: int):
+        self.size = size
+        self.times = np.empty(size, dtype=np.float64)
+        self.status = np.empty(size, dtype=np.int16)
+        self.idx = 0
+        self.count = 0
+    
+    def append(self, response_time: float, status_code: int):
+        """Write a sample, overwriting the oldest once full."""
+        idx = self.idx
+        self.times[idx] = response_time
+        self.status[idx] = status_code
+        self.idx = (idx + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+    
+    def filled_times(self) -> np.ndarray:
+        """Return the populated portion of the response time buffer."""
+        return self.times[:self.count]
+    
+    def filled_status(self) -> np.ndarray:
+        """Return the populated portion of the status code buffer."""
+        return self.status[:self.count]
+    
+    def __len__(self) -> int:
+        return self.count
+
+
 class ResponseTimeAnalytics:
     """
     Advanced response time tracking and analysis.
@@ -32,8 +66,7 @@ class ResponseTimeAnalytics:
             history_size: Number of responses to track per domain
         """
         self.history_size = history_size
-        self.response_times: Dict[str, deque] = defaultdict(lambda: deque(maxlen=history_size))
-        self.status_codes: Dict[str, List[int]] = defaultdict(list)
+        self.response_times: Dict[str, RingBuffer] = defaultdict(lambda: RingBuffer(history_size))
         self.error_counts: Dict[str, int] = defaultdict(int)
     
     def record(self, domain: str, response_time: float, status_code: int, success: bool = True):
@@ -46,13 +79,7 @@ class ResponseTimeAnalytics:
             status_code: HTTP status code
             success: Whether request succeeded
         """
-        self.response_times[domain].append({
-            'time': response_time,
-            'timestamp': datetime.now(),
-            'status': status_code
-        })
-        
-        self.status_codes[domain].append(status_code)
+        self.response_times[domain].append(response_time, status_code)
         
         if not success:
             self.error_counts[domain] += 1
@@ -64,26 +91,26 @@ class ResponseTimeAnalytics:
         if domain not in self.response_times or not self.response_times[domain]:
             return {}
         
-        times = [r['time'] for r in self.response_times[domain]]
+        times = self.response_times[domain].filled_times()
         
         return {
             'count': len(times),
-            'avg_response_time': mean(times),
-            'median_response_time': median(times),
-            'min_response_time': min(times),
-            'max_response_time': max(times),
+            'avg_response_time': float(times.mean()),
+            'median_response_time': float(np.median(times)),
+            'min_response_time': float(times.min()),
+            'max_response_time': float(times.max()),
             'error_count': self.error_counts.get(domain, 0),
             'p95': self._percentile(times, 95),
             'p99': self._percentile(times, 99)
         }
     
-    def _percentile(self, data: List[float], percentile: int) -> float:
+    def _percentile(self, data: np.ndarray, percentile: int) -> float:
         """Calculate percentile."""
-        if not data:
+        if not len(data):
             return 0.0
-        sorted_data = sorted(data)
+        sorted_data = np.sort(data)
         index = int(len(sorted_data) * (percentile / 100))
-        return sorted_data[min(index, len(sorted_data) - 1)]
+        return float(sorted_data[min(index, len(sorted_data) - 1)])
     
     def get_slowest_domains(self, limit: int = 10) -> List[tuple]:
         """Get slowest domains by average response time."""
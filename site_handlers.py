@@ -1,236 +1,186 @@
 """Site-specific scraping handlers using multi-strategy intelligent extraction."""
+import copy
 import logging
-from typing import Dict, Any
-from playwright.async_api import Page
+import re
+import time
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple, Union
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Page, Route
+from config_manager import get_config
 from extraction_strategies import IntelligentExtractor, Utils
+from url_utils import normalize_url
 
 logger = logging.getLogger("SiteHandlers")
 
-
-class DigikalaHandler:
-    """Handler for Digikala.com using intelligent extraction."""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'digikala.com' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using Digikala handler with multi-strategy extraction")
+# Recent extraction results keyed by normalized URL: {url: (timestamp, result)}
+EXTRACT_CACHE_TTL = get_config().get('scraper.extraction_cache.ttl', default=300)  # seconds, 0 disables
+EXTRACT_CACHE_MAX_ENTRIES = 1024
+_EXTRACT_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _get_cached_result(key: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of a fresh cached result, dropping it if expired."""
+    if EXTRACT_CACHE_TTL <= 0:
+        return None
+    
+    entry = _EXTRACT_CACHE.get(key)
+    if entry is None:
+        return None
+    
+    cached_at, result = entry
+    if time.monotonic() - cached_at > EXTRACT_CACHE_TTL:
+        _EXTRACT_CACHE.pop(key, None)
+        return None
+    
+    return copy.deepcopy(result)
+
+
+def _store_result(key: str, result: Dict[str, Any]):
+    """Cache a result, evicting the oldest entry when full."""
+    if EXTRACT_CACHE_TTL <= 0:
+        return
+    
+    _EXTRACT_CACHE.pop(key, None)
+    if len(_EXTRACT_CACHE) >= EXTRACT_CACHE_MAX_ENTRIES:
+        _EXTRACT_CACHE.pop(next(iter(_EXTRACT_CACHE)))
+    _EXTRACT_CACHE[key] = (time.monotonic(), copy.deepcopy(result))
+
+
+# Resources never needed for price extraction
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+_TRACKER_RE = re.compile(r'(google-analytics|googletagmanager|doubleclick|hotjar)\.')
+
+
+async def _route_handler(route: Route):
+    """Abort heavy non-HTML resources, let everything else through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def install_resource_blocker(target: Union[Page, BrowserContext]):
+    """
+    Block images, media, fonts, stylesheets and known trackers.
+    
+    Works on a page or a whole context; install it before navigation so
+    the initial load is already filtered.
+    """
+    await target.route('**/*', _route_handler)
+    # Registered last so it is matched first for tracker hosts
+    await target.route(_TRACKER_RE, lambda route: route.abort())
+
+
+async def _dismiss_digikala_popup(page: Page):
+    """Close Digikala's "not now" popup if it appears."""
+    try:
+        popup_button = page.locator('button:has-text("فعلا نه")')
+        await popup_button.wait_for(state="visible", timeout=3000)
+        await popup_button.click()
+        logger.info("Dismissed Digikala popup")
+        await page.wait_for_timeout(1000)
+    except:
+        logger.debug("No popup to dismiss")
+
+
+class SiteHandler:
+    """
+    Data-driven handler for a site using intelligent extraction.
+    
+    Every supported site runs the same multi-strategy extraction; sites only
+    differ by domain, result source tag and an optional page prelude
+    (e.g. dismissing a popup) run before extraction.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        domain: Optional[str],
+        source: str,
+        prelude: Optional[Callable[[Page], Awaitable[None]]] = None
+    ):
+        """
+        Args:
+            name: Display name used in logs and result metadata
+            domain: Site domain (None for the generic fallback)
+            source: Value written to result['source']
+            prelude: Optional coroutine run on the page before extraction
+        """
+        self.name = name
+        self.domain = domain
+        self.source = source
+        self.prelude = prelude
+    
+    async def can_handle(self, url: str) -> bool:
+        """Deprecated: use get_handler_for_url() instead."""
+        return self.domain is None or self.domain in url.lower()
+    
+    def get_cached_result(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a recent extraction result for the same product URL, or None.
         
-        # Handle popup
-        try:
-            popup_button = page.locator('button:has-text("فعلا نه")')
-            await popup_button.wait_for(state="visible", timeout=3000)
-            await popup_button.click()
-            logger.info("Dismissed Digikala popup")
-            await page.wait_for_timeout(1000)
-        except:
-            logger.debug("No popup to dismiss")
+        Check this before launching a browser so a hit skips navigation
+        entirely. Hits are marked with cached: True.
+        """
+        cached = _get_cached_result(normalize_url(url))
+        if cached is not None:
+            logger.info(f"Using cached {self.name} extraction result")
+            cached['source'] = self.source
+            cached['cached'] = True
+        return cached
+    
+    async def extract_price(self, page: Page, url: str) -> Dict[str, Any]:
+        logger.info(f"Using {self.name} handler with multi-strategy extraction")
         
-        # Use intelligent multi-strategy extraction
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'digikala'
-        return result
-
-
-class KhanoumiHandler:
-    """Handler for Khanoumi.com using intelligent extraction."""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'khanoumi.com' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using Khanoumi handler with multi-strategy extraction")
+        if self.prelude is not None:
+            await self.prelude(page)
         
         # Use intelligent multi-strategy extraction
         result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'khanoumi'
-        return result
-
-
-class LicenseMarketHandler:
-    """Handler for license-market.ir"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'license-market.ir' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using LicenseMarket handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'license-market'
-        return result
-
-
-class AccsellHandler:
-    """Handler for accsell.ir"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'accsell.ir' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using Accsell handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'accsell'
-        return result
-
-
-class IranianCardHandler:
-    """Handler for iranicard.ir"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'iranicard.ir' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using IranianCard handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'iranicard'
-        return result
-
-
-class ParsPremiumHandler:
-    """Handler for parspremium.ir"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'parspremium.ir' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using ParsPremium handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'parspremium'
-        return result
-
-
-class TorobHandler:
-    """Handler for torob.com"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'torob.com' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using Torob handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'torob'
+        result['source'] = self.source
+        _store_result(normalize_url(url), result)
         return result
 
 
-class IranGetHandler:
-    """Handler for iranget.com"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'iranget.com' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using IranGet handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'iranget'
-        return result
+# Fallback handler for unknown sites
+GENERIC_HANDLER = SiteHandler('Generic', None, 'generic')
 
+# Handler registry
+HANDLERS = [
+    SiteHandler('Digikala', 'digikala.com', 'digikala', prelude=_dismiss_digikala_popup),
+    SiteHandler('Khanoumi', 'khanoumi.com', 'khanoumi'),
+    SiteHandler('LicenseMarket', 'license-market.ir', 'license-market'),
+    SiteHandler('Accsell', 'accsell.ir', 'accsell'),
+    SiteHandler('IranianCard', 'iranicard.ir', 'iranicard'),
+    SiteHandler('ParsPremium', 'parspremium.ir', 'parspremium'),
+    SiteHandler('Torob', 'torob.com', 'torob'),
+    SiteHandler('IranGet', 'iranget.com', 'iranget'),
+    SiteHandler('SpotifyAcc', 'spotify-acc.ir', 'spotify-acc'),
+    SiteHandler('NetUserAcc', 'netuseracc.com', 'netuseracc'),
+    SiteHandler('NumberLand', 'numberland.ir', 'numberland'),
+    GENERIC_HANDLER,  # Always last
+]
 
-class SpotifyAccHandler:
-    """Handler for spotify-acc.ir"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'spotify-acc.ir' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using SpotifyAcc handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'spotify-acc'
-        return result
+# Hostname -> handler lookup
+_HANDLER_BY_DOMAIN = {handler.domain: handler for handler in HANDLERS if handler.domain}
 
+# Subdomain suffixes (".digikala.com" also covers "www." and "m.")
+_KNOWN_DOMAINS = tuple(_HANDLER_BY_DOMAIN)
+_KNOWN_SUFFIXES = tuple('.' + domain for domain in _KNOWN_DOMAINS)
 
-class NetUserAccHandler:
-    """Handler for netuseracc.com"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'netuseracc.com' in url.lower()
-    
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using NetUserAcc handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'netuseracc'
-        return result
 
-
-class NumberLandHandler:
-    """Handler for numberland.ir"""
-    
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return 'numberland.ir' in url.lower()
+def get_handler_for_url(url: str) -> SiteHandler:
+    """Get the appropriate handler for a URL by its hostname."""
+    host = urlparse(url).hostname or ''  # already lowercased
     
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using NumberLand handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'numberland'
-        return result
-
-
-class GenericHandler:
-    """Fallback handler for unknown sites using intelligent extraction."""
+    handler = _HANDLER_BY_DOMAIN.get(host)
+    if handler is not None:
+        return handler
     
-    @staticmethod
-    async def can_handle(url: str) -> bool:
-        return True
+    # Single C-level check rejects unknown hosts before the per-domain scan
+    if host.endswith(_KNOWN_SUFFIXES):
+        for domain, suffix in zip(_KNOWN_DOMAINS, _KNOWN_SUFFIXES):
+            if host.endswith(suffix):
+                return _HANDLER_BY_DOMAIN[domain]
     
-    @staticmethod
-    async def extract_price(page: Page, url: str) -> Dict[str, Any]:
-        logger.info("Using Generic handler with multi-strategy extraction")
-        
-        result = await IntelligentExtractor.extract_price(page, url)
-        result['source'] = 'generic'
-        return result
-
-
-# Handler registry (order matters - first match wins)
-HANDLERS = [
-    DigikalaHandler,
-    KhanoumiHandler,
-    LicenseMarketHandler,
-    AccsellHandler,
-    IranianCardHandler,
-    ParsPremiumHandler,
-    TorobHandler,
-    IranGetHandler,
-    SpotifyAccHandler,
-    NetUserAccHandler,
-    NumberLandHandler,
-    GenericHandler,  # Always last
-]
-
-
-async def get_handler_for_url(url: str):
-    """Get the appropriate handler for a URL."""
-    for handler_class in HANDLERS:
-        if await handler_class.can_handle(url):
-            return handler_class
-    return GenericHandler
+    return GENERIC_HANDLER
@@ -4,18 +4,122 @@ Sitemap.xml Parser
 Efficiently discovers URLs from XML sitemaps with priority support.
 """
 
+import asyncio
+import itertools
 import logging
+import re
+import shelve
+import threading
+import zlib
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple, Union
 import aiohttp
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+try:
+    import lxml.etree as LET
+    HAS_LXML = True
+except ImportError:
+    LET = None
+    HAS_LXML = False
 
 logger = logging.getLogger("SitemapParser")
 
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+NAMESPACES = {'sitemap': SITEMAP_NS}
+URL_TAG = f'{{{SITEMAP_NS}}}url'
+SITEMAP_TAG = f'{{{SITEMAP_NS}}}sitemap'
+
+XML_PARSE_ERRORS = (ET.ParseError, LET.XMLSyntaxError) if HAS_LXML else (ET.ParseError,)
+
+
+def _compile_child_text(name: str):
+    """Compile a reader returning the text of a sitemap child element ('' if absent)."""
+    if HAS_LXML:
+        return LET.XPath(f'string(sitemap:{name})', namespaces=NAMESPACES, smart_strings=False)
+    path = f'sitemap:{name}'
+    return lambda element: element.findtext(path, '', NAMESPACES)
+
+
+# Compiled once so the per-URL loop does no QName/namespace resolution
+_LOC = _compile_child_text('loc')
+_LASTMOD = _compile_child_text('lastmod')
+_CHANGEFREQ = _compile_child_text('changefreq')
+_PRIORITY = _compile_child_text('priority')
+
+# Connection pool settings shared by every fetch within one crawl
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300
+
+# Maximum child sitemaps fetched concurrently from one index
+CHILD_FETCH_CONCURRENCY = 8
+
+# Bytes read from the response per pull-parser feed
+STREAM_CHUNK_SIZE = 32768
+
+# "Sitemap: <url>" directive in robots.txt (any case, leading blanks, CRLF-safe)
+_ROBOTS_SITEMAP_RE = re.compile(rb'(?im)^[ \t]*sitemap:[ \t]*(\S+)')
+
+# Leading bytes of a gzip stream (sitemap.xml.gz files)
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Worker threads that run XML parsing off the event loop. Each is its own
+# single-thread executor: lxml parsers must stay on the thread that created
+# them, so a document is pinned to one worker for its whole lifetime.
+PARSE_WORKERS = 4
+_PARSE_THREADS = [
+    ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'sitemap-parse-{i}')
+    for i in range(PARSE_WORKERS)
+]
+_next_parse_thread = itertools.cycle(_PARSE_THREADS).__next__
+
+# Default shelve file when SitemapCache() is given no path
+SITEMAP_CACHE_PATH = 'sitemap_cache'
+
+
+# Fixed UTC offsets seen in <lastmod>, e.g. {'+03:30': timezone(...)}
+_TZ_OFFSETS: Dict[str, timezone] = {'Z': timezone.utc, '+00:00': timezone.utc}
+
+
+def _parse_lastmod(text: str) -> Optional[datetime]:
+    """
+    Parse a sitemap <lastmod> value.
+    
+    Slices the two shapes almost every sitemap uses (YYYY-MM-DD and
+    YYYY-MM-DDTHH:MM:SS with Z or +HH:MM) at fixed offsets and falls back to
+    fromisoformat for anything else. Returns None for unparseable values.
+    """
+    try:
+        n = len(text)
+        if n == 10 and text[4] == '-' and text[7] == '-':
+            return datetime(int(text[:4]), int(text[5:7]), int(text[8:10]))
+        
+        if (n == 20 or n == 25) and text[10] == 'T' and text[13] == ':' and text[16] == ':':
+            offset = text[19:]
+            tz = _TZ_OFFSETS.get(offset)
+            if tz is None and n == 25 and offset[0] in '+-' and offset[3] == ':':
+                delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))
+                tz = _TZ_OFFSETS[offset] = timezone(-delta if offset[0] == '-' else delta)
+            if tz is not None:
+                return datetime(
+                    int(text[:4]), int(text[5:7]), int(text[8:10]),
+                    int(text[11:13]), int(text[14:16]), int(text[17:19]),
+                    tzinfo=tz
+                )
+        
+        return datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
 
 class SitemapURL:
     """Represents a URL from sitemap."""
     
+    __slots__ = ('loc', 'lastmod', 'changefreq', 'priority')
+    
     def __init__(
         self,
         loc: str,
@@ -36,91 +140,391 @@ class SitemapURL:
             'change_frequency': self.changefreq,
             'priority': self.priority
         }
+    
+    @staticmethod
+    def to_dicts(items: Iterable['SitemapURL']) -> Iterator[Dict[str, Any]]:
+        """Lazily convert many SitemapURLs to dictionaries."""
+        for item in items:
+            lastmod = item.lastmod
+            yield {
+                'url': item.loc,
+                'last_modified': lastmod.isoformat() if lastmod else None,
+                'change_frequency': item.changefreq,
+                'priority': item.priority
+            }
+
+
+class SitemapCache:
+    """
+    Persistent cache of parsed sitemaps keyed by URL.
+    
+    Each entry keeps the ETag / Last-Modified validators of the response it
+    was parsed from, so re-crawls can send a conditional request and reuse
+    the parsed result when the server answers 304 Not Modified. Validators
+    and parsed URLs are stored under separate keys so building the request
+    headers never unpickles the (possibly huge) URL list.
+    
+    All methods do blocking file I/O; call them through asyncio.to_thread.
+    """
+    
+    def __init__(self, path: str = SITEMAP_CACHE_PATH):
+        self.path = path
+        # dbm backends are not safe to open from several threads at once
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls) -> Optional['SitemapCache']:
+        """Create a cache at scraper.sitemap.cache_path, or None when unset."""
+        from config_manager import get_config
+        path = get_config().get('scraper.sitemap.cache_path', default=None)
+        return cls(path) if path else None
+    
+    def get_validators(self, url: str) -> Optional[Dict[str, Optional[str]]]:
+        """Get the ETag / Last-Modified validators stored for URL."""
+        try:
+            with self._lock, shelve.open(self.path) as db:
+                return db.get(f'validators:{url}')
+        except Exception as e:
+            logger.debug(f"Sitemap cache read failed: {e}")
+            return None
+    
+    def get_result(self, url: str) -> Optional[Tuple[List[str], List[SitemapURL]]]:
+        """Get the cached (child sitemap URLs, page URLs) for URL."""
+        try:
+            with self._lock, shelve.open(self.path) as db:
+                return db.get(f'result:{url}')
+        except Exception as e:
+            logger.debug(f"Sitemap cache read failed: {e}")
+            return None
+    
+    def set(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        child_sitemaps: List[str],
+        urls: List[SitemapURL]
+    ):
+        """Store parsed result together with its validators."""
+        try:
+            with self._lock, shelve.open(self.path) as db:
+                db[f'result:{url}'] = (child_sitemaps, urls)
+                db[f'validators:{url}'] = {'etag': etag, 'last_modified': last_modified}
+        except Exception as e:
+            logger.debug(f"Sitemap cache write failed: {e}")
+    
+    def discard(self, url: str):
+        """Forget the validators and result stored for URL."""
+        try:
+            with self._lock, shelve.open(self.path) as db:
+                db.pop(f'validators:{url}', None)
+                db.pop(f'result:{url}', None)
+        except Exception as e:
+            logger.debug(f"Sitemap cache write failed: {e}")
+    
+    @staticmethod
+    def conditional_headers(validators: Optional[Dict[str, Optional[str]]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from stored validators."""
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
 
 
 class SitemapParser:
     """Parses XML sitemaps and extracts URLs."""
     
+    # Conditional-request cache, off by default; opt in with
+    # SitemapParser.cache = SitemapCache.from_config()
+    cache: Optional[SitemapCache] = None
+    
+    @staticmethod
+    def create_session() -> aiohttp.ClientSession:
+        """
+        Create a pooled session for sitemap fetching.
+        
+        Reusing one session keeps connections alive across child sitemaps
+        instead of paying a TCP+TLS handshake per fetch.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL
+        )
+        return aiohttp.ClientSession(connector=connector)
+    
     @staticmethod
-    async def fetch_sitemap(url: str) -> Optional[str]:
-        """Fetch sitemap content."""
+    async def fetch_sitemap(url: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[bytes]:
+        """
+        Fetch sitemap content.
+        
+        Args:
+            url: Sitemap URL
+            session: Shared session (a temporary one is created if omitted)
+            
+        Returns:
+            Raw XML bytes or None on failure
+        """
+        if session is None:
+            async with SitemapParser.create_session() as own_session:
+                return await SitemapParser.fetch_sitemap(url, own_session)
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        logger.info(f"Fetched sitemap: {url}")
-                        return content
-                    else:
-                        logger.warning(f"Sitemap fetch failed: {url} (status={response.status})")
-                        return None
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status == 200:
+                    content = await response.read()
+                    if content.startswith(GZIP_MAGIC):
+                        content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+                    logger.info(f"Fetched sitemap: {url}")
+                    return content
+                else:
+                    logger.warning(f"Sitemap fetch failed: {url} (status={response.status})")
+                    return None
         except Exception as e:
             logger.error(f"Failed to fetch sitemap {url}: {e}")
             return None
     
     @staticmethod
-    def parse_sitemap(xml_content: str) -> List[SitemapURL]:
+    def _build_sitemap_url(url_element) -> Optional[SitemapURL]:
+        """Build a SitemapURL from a <url> element (None if it has no <loc>)."""
+        loc = _LOC(url_element)
+        if not loc:
+            return None
+        
+        # Extract optional fields
+        lastmod_text = _LASTMOD(url_element)
+        lastmod = _parse_lastmod(lastmod_text) if lastmod_text else None
+        
+        changefreq = _CHANGEFREQ(url_element) or None
+        
+        priority_text = _PRIORITY(url_element)
+        priority = 0.5
+        if priority_text:
+            try:
+                priority = float(priority_text)
+            except:
+                pass
+        
+        return SitemapURL(
+            loc=loc,
+            lastmod=lastmod,
+            changefreq=changefreq,
+            priority=priority
+        )
+    
+    @staticmethod
+    def _release(element):
+        """Free a consumed element (and, with lxml, its finished siblings)."""
+        element.clear()
+        if HAS_LXML:
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+    
+    @staticmethod
+    def _iter_elements(xml_content: bytes, tag: str):
+        """
+        Stream-parse XML and yield each element matching tag.
+        
+        Elements are cleared after the caller has consumed them so peak
+        memory stays at one record rather than the whole document.
+        """
+        if HAS_LXML:
+            events = LET.iterparse(
+                BytesIO(xml_content), events=('end',), tag=tag,
+                resolve_entities=False, no_network=True
+            )
+        else:
+            events = ET.iterparse(BytesIO(xml_content), events=('end',))
+        
+        for _, element in events:
+            if element.tag == tag:
+                yield element
+                SitemapParser._release(element)
+    
+    @staticmethod
+    def _create_pull_parser(tag: Union[str, Tuple[str, ...]]):
+        """Create an incremental parser reporting end events for tag(s)."""
+        if HAS_LXML:
+            return LET.XMLPullParser(
+                events=('end',), tag=tag,
+                resolve_entities=False, no_network=True
+            )
+        return ET.XMLPullParser(events=('end',))
+    
+    @staticmethod
+    def _drain_urls(parser) -> Tuple[List[SitemapURL], List[str]]:
+        """
+        Collect every <url> and index <sitemap> the pull parser has completed.
+        
+        Returns:
+            (SitemapURLs, child sitemap locs) in document order
+        """
+        urls = []
+        sitemap_locs = []
+        for _, element in parser.read_events():
+            tag = element.tag
+            if tag == URL_TAG:
+                sitemap_url = SitemapParser._build_sitemap_url(element)
+                if sitemap_url is not None:
+                    urls.append(sitemap_url)
+            elif tag == SITEMAP_TAG:
+                loc = _LOC(element)
+                if loc:
+                    sitemap_locs.append(loc)
+            else:
+                # ElementTree reports every end event, children before their
+                # parent; leave <loc> etc. intact until the record closes
+                continue
+            SitemapParser._release(element)
+        return urls, sitemap_locs
+    
+    @staticmethod
+    def _open_parser(state: Dict[str, Any], tag: Union[str, Tuple[str, ...]]):
+        """Create a document's pull parser on its parse worker thread."""
+        state['parser'] = SitemapParser._create_pull_parser(tag)
+    
+    @staticmethod
+    def _feed_chunk(
+        state: Dict[str, Any],
+        data: bytes,
+        decompressor=None,
+        final: bool = False
+    ) -> Tuple[List[SitemapURL], List[str]]:
+        """
+        Decompress, feed and drain one chunk; runs on a parse worker thread.
+        
+        Must run on the worker that ran _open_parser for this state. The
+        parser only lives inside state, so it is never touched (or freed)
+        by another thread. Pass final=True with the last (possibly empty)
+        chunk.
+        """
+        if decompressor is not None:
+            data = decompressor.decompress(data)
+            if final:
+                data += decompressor.flush()
+        
+        parser = state['parser']
+        parser.feed(data)
+        if final:
+            parser.close()
+        return SitemapParser._drain_urls(parser)
+    
+    @staticmethod
+    def _sniff_tags(prefix: bytes, want_sitemaps: bool) -> Union[str, Tuple[str, ...]]:
+        """
+        Pick the element tag(s) to parse from the first bytes of a document.
+        
+        The root element name settles index vs urlset without decoding the
+        rest of the document; both tags are kept when the prefix is ambiguous.
+        """
+        if not want_sitemaps:
+            return URL_TAG
+        if b'<sitemapindex' in prefix:
+            return SITEMAP_TAG
+        if b'<urlset' in prefix:
+            return URL_TAG
+        return (URL_TAG, SITEMAP_TAG)
+    
+    @staticmethod
+    async def stream_sitemap(
+        response: aiohttp.ClientResponse,
+        on_sitemap: Optional[Callable[[str], None]] = None
+    ) -> AsyncIterator[SitemapURL]:
+        """
+        Parse a sitemap incrementally while it downloads.
+        
+        Chunks are fed to a pull parser as they arrive, so the first URLs
+        are available after the first chunk and memory stays bounded by
+        the chunk size instead of the document size. Gzipped sitemap files
+        are decompressed on the fly. Decompression and parsing run on one
+        parse worker per document (the parser never changes threads) so
+        other downloads keep progressing meanwhile.
+        
+        Args:
+            response: Open aiohttp response for a sitemap
+            on_sitemap: Optional callback receiving each child sitemap <loc>
+                if the response turns out to be a sitemap index
+            
+        Yields:
+            SitemapURL objects in document order
+        """
+        loop = asyncio.get_running_loop()
+        worker = _next_parse_thread()
+        state: Dict[str, Any] = {}
+        decompressor = None
+        
+        try:
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                if not state:
+                    # .gz sitemaps arrive as a raw gzip body (no Content-Encoding),
+                    # so aiohttp does not decode them for us
+                    if chunk.startswith(GZIP_MAGIC):
+                        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                        chunk = decompressor.decompress(chunk)
+                    
+                    tags = SitemapParser._sniff_tags(chunk, on_sitemap is not None)
+                    await loop.run_in_executor(worker, SitemapParser._open_parser, state, tags)
+                    urls, sitemap_locs = await loop.run_in_executor(
+                        worker, SitemapParser._feed_chunk, state, chunk
+                    )
+                else:
+                    urls, sitemap_locs = await loop.run_in_executor(
+                        worker, SitemapParser._feed_chunk, state, chunk, decompressor
+                    )
+                
+                # Callbacks run here, on the event loop thread (ElementTree
+                # reports <sitemap> even when it was not asked for)
+                if on_sitemap is not None:
+                    for loc in sitemap_locs:
+                        on_sitemap(loc)
+                for sitemap_url in urls:
+                    yield sitemap_url
+            
+            if not state:
+                return
+            
+            urls, sitemap_locs = await loop.run_in_executor(
+                worker, SitemapParser._feed_chunk, state, b'', decompressor, True
+            )
+            if on_sitemap is not None:
+                for loc in sitemap_locs:
+                    on_sitemap(loc)
+            for sitemap_url in urls:
+                yield sitemap_url
+        finally:
+            # Free the parser on its own thread, even if iteration stopped early
+            worker.submit(state.clear)
+    
+    @staticmethod
+    def parse_sitemap(xml_content: Union[bytes, str]) -> List[SitemapURL]:
         """
         Parse sitemap XML content.
         
         Args:
-            xml_content: XML string
+            xml_content: XML bytes (or string)
             
         Returns:
             List of SitemapURL objects
         """
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        
         urls = []
         
         try:
-            root = ET.fromstring(xml_content)
-            
-            # Define XML namespaces
-            namespaces = {
-                'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9'
-            }
-            
-            # Find all <url> elements
-            for url_element in root.findall('sitemap:url', namespaces):
-                loc_element = url_element.find('sitemap:loc', namespaces)
-                if loc_element is None:
-                    continue
-                
-                loc = loc_element.text
-                if not loc:
-                    continue
-                
-                # Extract optional fields
-                lastmod_element = url_element.find('sitemap:lastmod', namespaces)
-                lastmod = None
-                if lastmod_element is not None and lastmod_element.text:
-                    try:
-                        lastmod = datetime.fromisoformat(lastmod_element.text.replace('Z', '+00:00'))
-                    except:
-                        pass
-                
-                changefreq_element = url_element.find('sitemap:changefreq', namespaces)
-                changefreq = changefreq_element.text if changefreq_element is not None else None
-                
-                priority_element = url_element.find('sitemap:priority', namespaces)
-                priority = 0.5
-                if priority_element is not None and priority_element.text:
-                    try:
-                        priority = float(priority_element.text)
-                    except:
-                        pass
-                
-                sitemap_url = SitemapURL(
-                    loc=loc,
-                    lastmod=lastmod,
-                    changefreq=changefreq,
-                    priority=priority
-                )
-                urls.append(sitemap_url)
+            # Stream through all <url> elements
+            for url_element in SitemapParser._iter_elements(xml_content, URL_TAG):
+                sitemap_url = SitemapParser._build_sitemap_url(url_element)
+                if sitemap_url is not None:
+                    urls.append(sitemap_url)
             
             logger.info(f"Parsed {len(urls)} URLs from sitemap")
             return urls
             
-        except ET.ParseError as e:
+        except XML_PARSE_ERRORS as e:
             logger.error(f"XML parse error: {e}")
             return []
         except Exception as e:
@@ -128,30 +532,27 @@ class SitemapParser:
             return []
     
     @staticmethod
-    def parse_sitemap_index(xml_content: str) -> List[str]:
+    def parse_sitemap_index(xml_content: Union[bytes, str]) -> List[str]:
         """
         Parse sitemap index file to get child sitemap URLs.
         
         Args:
-            xml_content: Sitemap index XML
+            xml_content: Sitemap index XML bytes (or string)
             
         Returns:
             List of child sitemap URLs
         """
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        
         sitemap_urls = []
         
         try:
-            root = ET.fromstring(xml_content)
-            
-            namespaces = {
-                'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9'
-            }
-            
-            # Find all <sitemap> elements
-            for sitemap_element in root.findall('sitemap:sitemap', namespaces):
-                loc_element = sitemap_element.find('sitemap:loc', namespaces)
-                if loc_element is not None and loc_element.text:
-                    sitemap_urls.append(loc_element.text)
+            # Stream through all <sitemap> elements
+            for sitemap_element in SitemapParser._iter_elements(xml_content, SITEMAP_TAG):
+                loc = _LOC(sitemap_element)
+                if loc:
+                    sitemap_urls.append(loc)
             
             logger.info(f"Found {len(sitemap_urls)} child sitemaps in index")
             return sitemap_urls
@@ -161,74 +562,192 @@ class SitemapParser:
             return []
     
     @staticmethod
-    async def discover_from_robots(base_url: str) -> List[str]:
+    async def discover_from_robots(base_url: str, session: Optional[aiohttp.ClientSession] = None) -> List[str]:
         """
-        Discover sitemap URLs from robots.txt.
+        Discover sitemap URLs from robots.txt (plus an unlisted /sitemap.xml).
         
         Args:
             base_url: Base URL of website
+            session: Shared session (a temporary one is created if omitted)
             
         Returns:
             List of sitemap URLs
         """
         from urllib.parse import urljoin
         
+        if session is None:
+            async with SitemapParser.create_session() as own_session:
+                return await SitemapParser.discover_from_robots(base_url, own_session)
+        
         robots_url = urljoin(base_url, '/robots.txt')
+        default_sitemap_url = urljoin(base_url, '/sitemap.xml')
+        
+        # Read robots.txt and probe the conventional sitemap location concurrently
+        robots_result, probe_result = await asyncio.gather(
+            SitemapParser._read_robots(robots_url, session),
+            SitemapParser._probe_sitemap(default_sitemap_url, session),
+            return_exceptions=True
+        )
+        
         sitemap_urls = []
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        content = await response.text()
+        if isinstance(robots_result, Exception):
+            logger.debug(f"Failed to discover sitemaps from robots.txt: {robots_result}")
+        else:
+            sitemap_urls.extend(robots_result)
+            logger.info(f"Discovered {len(sitemap_urls)} sitemaps from robots.txt")
+        
+        if probe_result is True and default_sitemap_url not in sitemap_urls:
+            sitemap_urls.append(default_sitemap_url)
+            logger.info(f"Found unlisted sitemap: {default_sitemap_url}")
+        
+        return sitemap_urls
+    
+    @staticmethod
+    async def _read_robots(robots_url: str, session: aiohttp.ClientSession) -> List[str]:
+        """Fetch robots.txt and return its Sitemap directives."""
+        sitemap_urls = []
+        
+        async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status == 200:
+                content = await response.read()
+                
+                # Parse robots.txt for Sitemap directives in one regex pass
+                sitemap_urls = [
+                    match.group(1).decode('utf-8', 'ignore')
+                    for match in _ROBOTS_SITEMAP_RE.finditer(content)
+                ]
+        
+        return sitemap_urls
+    
+    @staticmethod
+    async def _probe_sitemap(url: str, session: aiohttp.ClientSession) -> bool:
+        """Check with a HEAD request whether a sitemap exists at URL."""
+        async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            return response.status == 200
+    
+    @staticmethod
+    async def _fetch_and_parse(
+        url: str,
+        semaphore: asyncio.Semaphore,
+        session: aiohttp.ClientSession,
+        on_sitemap: Optional[Callable[[str], None]] = None
+    ) -> Tuple[List[str], List[SitemapURL]]:
+        """
+        Stream and parse one sitemap under the concurrency limit.
+        
+        Sends conditional headers when a cached copy exists and reuses the
+        cached result on 304 Not Modified.
+        
+        Args:
+            url: Sitemap URL
+            semaphore: Shared concurrency limit
+            session: Shared session
+            on_sitemap: Optional callback receiving child sitemap locs as
+                they are parsed (not called for cached results)
+        
+        Returns:
+            (child sitemap URLs, page URLs) - the first is non-empty for indexes
+        """
+        cache = SitemapParser.cache
+        validators = await asyncio.to_thread(cache.get_validators, url) if cache else None
+        child_sitemaps = []
+        urls = []
+        
+        def collect_sitemap(loc: str):
+            child_sitemaps.append(loc)
+            if on_sitemap is not None:
+                on_sitemap(loc)
+        
+        async with semaphore:
+            try:
+                while True:
+                    async with session.get(
+                        url,
+                        headers=SitemapCache.conditional_headers(validators),
+                        timeout=aiohttp.ClientTimeout(total=30)
+                    ) as response:
+                        if response.status == 304 and validators:
+                            cached = await asyncio.to_thread(cache.get_result, url)
+                            if cached is not None:
+                                logger.info(f"Sitemap not modified, using cache: {url}")
+                                return cached
+                            
+                            # Validators outlived their result; refetch unconditionally
+                            logger.warning(f"Sitemap cache entry incomplete, refetching: {url}")
+                            await asyncio.to_thread(cache.discard, url)
+                            validators = None
+                            continue
                         
-                        # Parse robots.txt for Sitemap directives
-                        for line in content.split('\n'):
-                            if line.lower().startswith('sitemap:'):
-                                sitemap_url = line.split(':', 1)[1].strip()
-                                sitemap_urls.append(sitemap_url)
+                        if response.status != 200:
+                            logger.warning(f"Sitemap fetch failed: {url} (status={response.status})")
+                            return child_sitemaps, urls
                         
-                        logger.info(f"Discovered {len(sitemap_urls)} sitemaps from robots.txt")
-            
-            return sitemap_urls
-            
-        except Exception as e:
-            logger.debug(f"Failed to discover sitemaps from robots.txt: {e}")
-            return []
+                        async for sitemap_url in SitemapParser.stream_sitemap(response, collect_sitemap):
+                            urls.append(sitemap_url)
+                        
+                        etag = response.headers.get('ETag')
+                        last_modified = response.headers.get('Last-Modified')
+                        if cache and (etag or last_modified):
+                            await asyncio.to_thread(
+                                cache.set, url, etag, last_modified, child_sitemaps, urls
+                            )
+                        break
+            except XML_PARSE_ERRORS as e:
+                logger.error(f"XML parse error in {url}: {e}")
+            except Exception as e:
+                logger.error(f"Failed to fetch sitemap {url}: {e}")
+        
+        logger.info(f"Parsed {len(urls)} URLs from sitemap {url}")
+        return child_sitemaps, urls
     
     @staticmethod
-    async def get_all_urls(sitemap_url: str) -> List[SitemapURL]:
+    async def get_all_urls(sitemap_url: str, session: Optional[aiohttp.ClientSession] = None) -> List[SitemapURL]:
         """
         Get all URLs from sitemap (handles both regular and index).
         
         Args:
             sitemap_url: Sitemap URL
+            session: Shared session (a pooled one is created if omitted)
             
         Returns:
             List of all URLs
         """
+        if session is None:
+            async with SitemapParser.create_session() as own_session:
+                return await SitemapParser.get_all_urls(sitemap_url, own_session)
+        
         all_urls = []
+        semaphore = asyncio.Semaphore(CHILD_FETCH_CONCURRENCY)
+        child_tasks: Dict[str, asyncio.Task] = {}
+        
+        def start_child(child_url: str):
+            # Children start downloading while the index is still streaming
+            if child_url not in child_tasks:
+                child_tasks[child_url] = asyncio.create_task(
+                    SitemapParser._fetch_and_parse(child_url, semaphore, session)
+                )
         
-        # Fetch sitemap
-        content = await SitemapParser.fetch_sitemap(sitemap_url)
-        if not content:
-            return all_urls
+        # Fetch sitemap (collects child sitemaps if it is an index)
+        child_sitemaps, urls = await SitemapParser._fetch_and_parse(
+            sitemap_url, semaphore, session, on_sitemap=start_child
+        )
+        all_urls.extend(urls)
         
-        # Check if it's a sitemap index
-        if '<sitemapindex' in content:
-            # Parse index to get child sitemaps
-            child_sitemaps = SitemapParser.parse_sitemap_index(content)
+        if child_sitemaps:
+            logger.info(f"Found {len(child_sitemaps)} child sitemaps in index")
             
-            # Fetch and parse each child sitemap
+            # Cached indexes did not stream, so start any remaining children
             for child_url in child_sitemaps:
-                child_content = await SitemapParser.fetch_sitemap(child_url)
-                if child_content:
-                    urls = SitemapParser.parse_sitemap(child_content)
-                    all_urls.extend(urls)
-        else:
-            # Regular sitemap
-            urls = SitemapParser.parse_sitemap(content)
-            all_urls.extend(urls)
+                start_child(child_url)
+            
+            results = await asyncio.gather(*child_tasks.values(), return_exceptions=True)
+            
+            for child_url, result in zip(child_tasks, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Child sitemap failed {child_url}: {result}")
+                    continue
+                all_urls.extend(result[1])
         
         logger.info(f"Total URLs extracted: {len(all_urls)}")
         return all_urls
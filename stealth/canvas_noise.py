@@ -11,10 +11,10 @@ Techniques:
 - AudioContext fingerprint noise
 """
 
+import json
 import logging
-import random
-from typing import Optional
-from playwright.async_api import Page
+from typing import List, Optional
+from playwright.async_api import BrowserContext, Page
 from config_manager import get_config
 
 logger = logging.getLogger(__name__)
@@ -34,8 +34,16 @@ class CanvasNoiseInjector:
         self.enabled = self.config.get('stealth.canvas_noise.enabled', default=True)
         self.noise_intensity = self.config.get('stealth.canvas_noise.intensity', default=5)
         
+        # Script only depends on config, so build it once
+        self._script = self._generate_canvas_noise_script()
+        
         logger.info(f"Canvas Noise Injection: {'Enabled' if self.enabled else 'Disabled'} (intensity={self.noise_intensity})")
     
+    @property
+    def script(self) -> str:
+        """Init script for this injector ('' when disabled)."""
+        return self._script if self.enabled else ''
+    
     async def inject(self, page: Page):
         """
         Inject canvas noise into the page context.
@@ -49,8 +57,7 @@ class CanvasNoiseInjector:
         if not self.enabled:
             return
         
-        noise_script = self._generate_canvas_noise_script()
-        await page.add_init_script(noise_script)
+        await page.add_init_script(self._script)
         
         logger.debug("Canvas noise injected into page context")
     
@@ -65,31 +72,50 @@ class CanvasNoiseInjector:
         
         return f"""
         (function() {{
+            const INTENSITY = {noise_intensity};
+            const RANGE = INTENSITY * 2 + 1;
+            const MAX_RANDOM_BYTES = 65536;  // getRandomValues() per-call limit
+            
+            // Fill a byte buffer with random values in one native pass
+            function fillNoise(buffer) {{
+                for (let offset = 0; offset < buffer.length; offset += MAX_RANDOM_BYTES) {{
+                    crypto.getRandomValues(buffer.subarray(offset, offset + MAX_RANDOM_BYTES));
+                }}
+            }}
+            
             // Override getImageData to add noise
             const originalGetImageData = CanvasRenderingContext2D.prototype.getImageData;
             CanvasRenderingContext2D.prototype.getImageData = function(...args) {{
                 const imageData = originalGetImageData.apply(this, args);
+                const data = imageData.data;  // Uint8ClampedArray: writes clamp to 0..255
+                const pixels = data.length >> 2;
+                const noise = new Uint8Array(pixels);
+                fillNoise(noise);
                 
-                // Add random noise to pixel values
-                for (let i = 0; i < imageData.data.length; i += 4) {{
-                    const noise = Math.floor(Math.random() * {noise_intensity * 2}) - {noise_intensity};
-                    
-                    imageData.data[i] = Math.min(255, Math.max(0, imageData.data[i] + noise));      // R
-                    imageData.data[i+1] = Math.min(255, Math.max(0, imageData.data[i+1] + noise));  // G
-                    imageData.data[i+2] = Math.min(255, Math.max(0, imageData.data[i+2] + noise));  // B
-                    // Alpha channel (i+3) unchanged
+                // Add the same random offset to R, G and B; alpha unchanged
+                for (let p = 0, i = 0; p < pixels; p++, i += 4) {{
+                    const offset = (noise[p] % RANGE) - INTENSITY;
+                    data[i] += offset;
+                    data[i + 1] += offset;
+                    data[i + 2] += offset;
                 }}
                 
                 return imageData;
             }};
             
-            // Override toDataURL to add noise
+            // Override toDataURL to add noise: bake one noisy read back into
+            // the canvas so the encoder sees it, once per canvas
+            const perturbedCanvases = new WeakSet();
+            const originalPutImageData = CanvasRenderingContext2D.prototype.putImageData;
             const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
             HTMLCanvasElement.prototype.toDataURL = function(...args) {{
-                const context = this.getContext('2d');
-                if (context) {{
-                    const imageData = context.getImageData(0, 0, this.width, this.height);
-                    // Noise already added via getImageData override
+                if (!perturbedCanvases.has(this) && this.width && this.height) {{
+                    const context = this.getContext('2d');
+                    if (context) {{
+                        const imageData = context.getImageData(0, 0, this.width, this.height);
+                        originalPutImageData.call(context, imageData, 0, 0);
+                        perturbedCanvases.add(this);
+                    }}
                 }}
                 return originalToDataURL.apply(this, args);
             }};
@@ -107,6 +133,27 @@ class FontFingerprintRandomizer:
     slightly between systems. We add random offsets to make tracking harder.
     """
     
+    SCRIPT = """
+    (function() {
+        // Randomize measureText results
+        const originalMeasureText = CanvasRenderingContext2D.prototype.measureText;
+        CanvasRenderingContext2D.prototype.measureText = function(...args) {
+            const metrics = originalMeasureText.apply(this, args);
+            
+            // Add small random offsets to width
+            const offset = (Math.random() - 0.5) * 0.1;
+            Object.defineProperty(metrics, 'width', {
+                value: metrics.width + offset,
+                writable: false
+            });
+            
+            return metrics;
+        };
+        
+        console.log('[Stealth] Font metric randomization active');
+    })();
+    """
+    
     def __init__(self):
         """Initialize font randomizer."""
         self.config = get_config()
@@ -114,33 +161,17 @@ class FontFingerprintRandomizer:
         
         logger.info(f"Font Randomization: {'Enabled' if self.enabled else 'Disabled'}")
     
+    @property
+    def script(self) -> str:
+        """Init script for this randomizer ('' when disabled)."""
+        return self.SCRIPT if self.enabled else ''
+    
     async def inject(self, page: Page):
         """Inject font metric randomization."""
         if not self.enabled:
             return
         
-        script = """
-        (function() {
-            // Randomize measureText results
-            const originalMeasureText = CanvasRenderingContext2D.prototype.measureText;
-            CanvasRenderingContext2D.prototype.measureText = function(...args) {
-                const metrics = originalMeasureText.apply(this, args);
-                
-                // Add small random offsets to width
-                const offset = (Math.random() - 0.5) * 0.1;
-                Object.defineProperty(metrics, 'width', {
-                    value: metrics.width + offset,
-                    writable: false
-                });
-                
-                return metrics;
-            };
-            
-            console.log('[Stealth] Font metric randomization active');
-        })();
-        """
-        
-        await page.add_init_script(script)
+        await page.add_init_script(self.SCRIPT)
         logger.debug("Font randomization injected")
 
 
@@ -164,18 +195,40 @@ class WebGLFingerprintSpoofer:
             "ANGLE (NVIDIA, NVIDIA GeForce RTX 3060 Direct3D11 vs_5_0 ps_5_0)"
         ]
         
+        # Renderer is picked inside the script, so one script serves every page
+        self._script = self._generate_webgl_script(self.fake_renderers)
+        
         logger.info(f"WebGL Spoofing: {'Enabled' if self.enabled else 'Disabled'}")
     
+    @property
+    def script(self) -> str:
+        """Init script for this spoofer ('' when disabled)."""
+        return self._script if self.enabled else ''
+    
     async def inject(self, page: Page):
         """Inject WebGL parameter spoofing."""
         if not self.enabled:
             return
         
-        # Pick a random common renderer
-        fake_renderer = random.choice(self.fake_renderers)
+        await page.add_init_script(self._script)
+        logger.debug("WebGL spoofing injected")
+    
+    @staticmethod
+    def _generate_webgl_script(fake_renderers: List[str]) -> str:
+        """
+        Generate WebGL spoofing JavaScript.
+        
+        The renderer is chosen per page inside the browser, keeping the
+        script text identical across pages.
+        """
+        renderers_json = json.dumps(fake_renderers)
         
-        script = f"""
+        return f"""
         (function() {{
+            // Pick a random common renderer
+            const RENDERERS = {renderers_json};
+            const fakeRenderer = RENDERERS[crypto.getRandomValues(new Uint32Array(1))[0] % RENDERERS.length];
+            
             const getParameter = WebGLRenderingContext.prototype.getParameter;
             WebGLRenderingContext.prototype.getParameter = function(parameter) {{
                 // Override UNMASKED_VENDOR_WEBGL
@@ -184,7 +237,7 @@ class WebGLFingerprintSpoofer:
                 }}
                 // Override UNMASKED_RENDERER_WEBGL
                 if (parameter === 37446) {{
-                    return '{fake_renderer}';
+                    return fakeRenderer;
                 }}
                 return getParameter.call(this, parameter);
             }};
@@ -192,9 +245,6 @@ class WebGLFingerprintSpoofer:
             console.log('[Stealth] WebGL fingerprint spoofed');
         }})();
         """
-        
-        await page.add_init_script(script)
-        logger.debug(f"WebGL spoofed: {fake_renderer}")
 
 
 class StealthInjector:
@@ -211,23 +261,53 @@ class StealthInjector:
         self.font_randomizer = FontFingerprintRandomizer()
         self.webgl_spoof = WebGLFingerprintSpoofer()
         
+        # All scripts are static now, so combine them once
+        self._combined = self._combined_script()
+        
         logger.info("Stealth Injector initialized (Canvas, Font, WebGL)")
     
     async def inject_all(self, page: Page):
         """
         Inject all stealth scripts into page.
         
-        Call this BEFORE navigating to the target page.
+        Fallback for one-off pages; prefer inject_context() for pages
+        created from a shared context. Call this BEFORE navigating to
+        the target page.
         
         Args:
             page: Playwright page object
         """
-        await self.canvas_noise.inject(page)
-        await self.font_randomizer.inject(page)
-        await self.webgl_spoof.inject(page)
+        if self._combined:
+            await page.add_init_script(self._combined)
         
         logger.info("✅ All stealth scripts injected")
     
+    async def inject_context(self, context: BrowserContext):
+        """
+        Register all stealth scripts on a browser context.
+        
+        Every page opened from the context inherits the scripts, so this
+        replaces per-page inject_all() calls. Call it right after
+        browser.new_context(), before opening pages.
+        
+        Args:
+            context: Playwright browser context
+        """
+        if self._combined:
+            await context.add_init_script(self._combined)
+        
+        logger.info("✅ Stealth scripts registered on browser context")
+    
+    def _combined_script(self) -> str:
+        """
+        Concatenate the enabled stealth scripts into one init script.
+        
+        Each script is a self-contained IIFE, so they can be joined and
+        registered with a single add_init_script round-trip.
+        """
+        scripts = (self.canvas_noise.script, self.font_randomizer.script, self.webgl_spoof.script)
+        return '\n'.join(script for script in scripts if script)
+    
     async def test_fingerprint(self, page: Page) -> dict:
         """
         Test fingerprint by navigating to a fingerprinting site.
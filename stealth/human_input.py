@@ -5,27 +5,151 @@ Generates realistic mouse movements and keyboard input patterns that
 mimic actual human behavior, evading bot detection systems.
 
 Features:
-- B-spline curve mouse movement
+- Smooth curved mouse movement (Bezier / Catmull-Rom)
 - Variable typing delays (keystroke dynamics)
 - Random scroll patterns
 - Click hesitation and overshoot
 """
 
-import logging
-import random
 import asyncio
-from typing import Tuple, List, Optional
+import functools
+import logging
+import re
+from collections import OrderedDict
+from typing import List, Tuple, Optional
 import numpy as np
-from scipy.interpolate import splprep, splev
 from playwright.async_api import Page
 from config_manager import get_config
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
+# Mouse paths are reused between moves whose endpoints fall in the same
+# PATH_BUCKET_PX grid cells; a smooth bump of PATH_JITTER_FRACTION of the
+# move distance keeps reused paths distinct
+PATH_CACHE_SIZE = 256
+PATH_BUCKET_PX = 20
+PATH_JITTER_FRACTION = 0.03
+
+
+def _bezier_curve(control: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a Bezier curve defined by up to 4 control points.
+    
+    Args:
+        control: (k, 2) control points, k <= 4
+        u: Curve parameters in [0, 1]
+        
+    Returns:
+        (len(u), 2) array of points
+    """
+    degree = len(control) - 1
+    t = u[:, None]
+    s = 1.0 - t
+    if degree == 3:
+        return s**3 * control[0] + 3 * s**2 * t * control[1] + 3 * s * t**2 * control[2] + t**3 * control[3]
+    if degree == 2:
+        return s**2 * control[0] + 2 * s * t * control[1] + t**2 * control[2]
+    return s * control[0] + t * control[-1]
+
+
+def _bezier_kernel(control: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Scalar-loop form of _bezier_curve, compiled with numba when available."""
+    degree = control.shape[0] - 1
+    out = np.empty((u.shape[0], 2))
+    for i in range(u.shape[0]):
+        t = u[i]
+        s = 1.0 - t
+        for j in range(2):
+            if degree == 3:
+                out[i, j] = (s * s * s * control[0, j] + 3.0 * s * s * t * control[1, j]
+                             + 3.0 * s * t * t * control[2, j] + t * t * t * control[3, j])
+            elif degree == 2:
+                out[i, j] = s * s * control[0, j] + 2.0 * s * t * control[1, j] + t * t * control[2, j]
+            else:
+                out[i, j] = s * control[0, j] + t * control[degree, j]
+    return out
+
+
+if HAS_NUMBA:
+    # Native code beats NumPy's per-call overhead on these tiny arrays;
+    # cache=True keeps the compiled kernel on disk across runs
+    _bezier_curve = njit(cache=True)(_bezier_kernel)
+
+
+def _arc_length(path: np.ndarray) -> np.ndarray:
+    """Cumulative distance along a (N, 2) path, starting at 0."""
+    steps = np.diff(path, axis=0)
+    return np.concatenate([[0.0], np.cumsum(np.hypot(steps[:, 0], steps[:, 1]))])
+
+
+def _catmull_rom_curve(control: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """
+    Evaluate a uniform Catmull-Rom spline passing through every control point.
+    
+    Args:
+        control: (k, 2) control points, k >= 2
+        u: Curve parameters in [0, 1], spread evenly over the k-1 segments
+        
+    Returns:
+        (len(u), 2) array of points
+    """
+    num_segments = len(control) - 1
+    # Duplicate the end points so the first/last segments have neighbours
+    padded = np.concatenate([control[:1], control, control[-1:]])
+    
+    scaled = u * num_segments
+    segment = np.minimum(scaled.astype(np.intp), num_segments - 1)
+    t = (scaled - segment)[:, None]
+    
+    p0 = padded[segment]
+    p1 = padded[segment + 1]
+    p2 = padded[segment + 2]
+    p3 = padded[segment + 3]
+    
+    return 0.5 * (
+        2 * p1
+        + (p2 - p0) * t
+        + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t**2
+        + (3 * p1 - p0 - 3 * p2 + p3) * t**3
+    )
+
+
+def _build_adjacent_keys() -> Tuple[Optional[str], ...]:
+    """Build a 128-entry table of QWERTY neighbours indexed by ASCII code."""
+    keyboard_layout = {
+        'a': 'sq', 'b': 'vgn', 'c': 'xvd', 'd': 'sfc', 'e': 'wr',
+        'f': 'dgv', 'g': 'fht', 'h': 'gjy', 'i': 'uo', 'j': 'hku',
+        'k': 'jli', 'l': 'kp', 'm': 'nj', 'n': 'bmh', 'o': 'ip',
+        'p': 'ol', 'q': 'wa', 'r': 'et', 's': 'adw', 't': 'ry',
+        'u': 'yi', 'v': 'cfb', 'w': 'qse', 'x': 'zcd', 'y': 'tu',
+        'z': 'xs'
+    }
+    
+    table = [None] * 128
+    for key, adjacent in keyboard_layout.items():
+        table[ord(key)] = adjacent
+        table[ord(key.upper())] = adjacent
+    return tuple(table)
+
+
+# A word plus the spaces/punctuation after it (chunked typing boundaries)
+_TYPING_CHUNK_RE = re.compile(r'[^\s.,!?;:]+[\s.,!?;:]*|[\s.,!?;:]+')
+TYPING_CHUNK_MIN = 3
+TYPING_CHUNK_MAX = 6
+
+# Adjacent keys for typo simulation (lowercase neighbours for both cases)
+_ADJACENT_KEYS = _build_adjacent_keys()
+
 
 class HumanMouseSimulator:
     """
-    Simulates human-like mouse movements using B-spline curves.
+    Simulates human-like mouse movements using smooth curves.
     
     Real humans don't move the mouse in straight lines. Instead, they
     follow smooth, slightly curved paths with variable speeds.
@@ -35,6 +159,9 @@ class HumanMouseSimulator:
         """Initialize mouse simulator."""
         self.config = get_config()
         self.enabled = self.config.get('stealth.human_input.enabled', default=True)
+        # Per-instance PCG64 generator: no shared global PRNG state/lock
+        self._rng = np.random.default_rng()
+        self._path_cache: OrderedDict = OrderedDict()
         self.speed_px_per_sec = self.config.get('stealth.human_input.mouse_speed_px_per_sec', default=800)
         
         logger.info(f"Human Mouse Simulator: {'Enabled' if self.enabled else 'Disabled'} ({self.speed_px_per_sec} px/s)")
@@ -44,9 +171,9 @@ class HumanMouseSimulator:
         start: Tuple[float, float],
         end: Tuple[float, float],
         num_points: int = 50
-    ) -> List[Tuple[float, float]]:
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Generate smooth B-spline curve from start to end.
+        Generate a smooth curve from start to end.
         
         Args:
             start: Starting (x, y) coordinates
@@ -54,12 +181,47 @@ class HumanMouseSimulator:
             num_points: Number of points in the path
             
         Returns:
-            List of (x, y) coordinate tuples forming smooth curve
+            ((N, 2) float32 array of x, y coordinates forming smooth curve,
+             (N,) cumulative arc length in pixels at each point)
         """
         if not self.enabled:
             # Straight line fallback
-            return [start, end]
+            path = np.array([start, end], dtype=np.float32)
+            return path, _arc_length(path)
         
+        key = (
+            int(start[0] // PATH_BUCKET_PX), int(start[1] // PATH_BUCKET_PX),
+            int(end[0] // PATH_BUCKET_PX), int(end[1] // PATH_BUCKET_PX),
+            num_points
+        )
+        base = self._path_cache.get(key)
+        if base is None:
+            base = self._build_path(start, end, num_points)
+            if len(self._path_cache) >= PATH_CACHE_SIZE:
+                self._path_cache.popitem(last=False)
+            self._path_cache[key] = base
+        else:
+            self._path_cache.move_to_end(key)
+        
+        # Shift the cached curve linearly so it starts and ends exactly on
+        # the requested points, then bend it by one smooth bump that vanishes
+        # at both ends (per-point noise would turn the curve into a zigzag)
+        u = np.linspace(0, 1, len(base), dtype=np.float32)[:, None]
+        start_shift = np.asarray(start, dtype=np.float32) - base[0]
+        end_shift = np.asarray(end, dtype=np.float32) - base[-1]
+        distance = np.hypot(end[0] - start[0], end[1] - start[1])
+        bump = self._rng.normal(0, PATH_JITTER_FRACTION * distance, size=2)
+        path = (base + (1 - u) * start_shift + u * end_shift + np.sin(np.pi * u) * bump).astype(np.float32)
+        path[0], path[-1] = start, end  # sin(pi) is only ~0 in float32
+        return path, _arc_length(path)
+    
+    def _build_path(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        num_points: int
+    ) -> np.ndarray:
+        """Fit a new randomized curve from start to end."""
         # Calculate distance
         distance = np.sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2)
         
@@ -71,26 +233,19 @@ class HumanMouseSimulator:
         
         # Add random offsets to middle control points (not start/end)
         offset_magnitude = min(50, distance * 0.1)  # 10% of distance, max 50px
-        for i in range(1, num_control_points - 1):
-            control_x[i] += np.random.randn() * offset_magnitude
-            control_y[i] += np.random.randn() * offset_magnitude
+        control_x[1:-1] += self._rng.standard_normal(num_control_points - 2) * offset_magnitude
+        control_y[1:-1] += self._rng.standard_normal(num_control_points - 2) * offset_magnitude
         
-        try:
-            # Fit B-spline curve
-            tck, u = splprep([control_x, control_y], s=0, k=min(3, num_control_points - 1))
-            
-            # Evaluate spline at evenly spaced points
-            u_new = np.linspace(0, 1, num_points)
-            x_new, y_new = splev(u_new, tck)
-            
-            # Convert to list of tuples
-            path = list(zip(x_new, y_new))
-            
-            return path
-            
-        except Exception as e:
-            logger.warning(f"B-spline generation failed: {e}. Using straight line.")
-            return [start, end]
+        control = np.column_stack([control_x, control_y])
+        u_new = np.linspace(0, 1, num_points)
+        
+        # Closed-form evaluation; a single cubic covers short moves
+        if num_control_points <= 4:
+            curve = _bezier_curve(control, u_new)
+        else:
+            curve = _catmull_rom_curve(control, u_new)
+        
+        return curve.astype(np.float32)
     
     async def move_to(
         self,
@@ -122,25 +277,49 @@ class HumanMouseSimulator:
             start_y = viewport['height'] / 2
         
         # Generate smooth path
-        path = self.generate_human_path((start_x, start_y), (x, y))
-        
-        # Calculate total distance
-        total_distance = sum(
-            np.sqrt((path[i+1][0] - path[i][0])**2 + (path[i+1][1] - path[i][1])**2)
-            for i in range(len(path) - 1)
-        )
-        
-        # Calculate total time based on speed
-        total_time = total_distance / self.speed_px_per_sec
+        path, arc_length = self.generate_human_path((start_x, start_y), (x, y))
+        await self._follow_path(page, path, arc_length)
+    
+    async def _follow_path(
+        self,
+        page: Page,
+        path: np.ndarray,
+        arc_length: np.ndarray,
+        pause_index: Optional[int] = None,
+        pause: float = 0.0
+    ):
+        """
+        Emit mouse moves along a path at the configured speed.
         
-        # Move along path
-        for i, (px, py) in enumerate(path):
-            await page.mouse.move(px, py)
+        Args:
+            page: Playwright Page object
+            path: (N, 2) array of points
+            arc_length: (N,) cumulative distance at each point
+            pause_index: Optional point after which to hold still
+            pause: Seconds to hold at pause_index
+        """
+        # Variable delay between points, proportional to each segment's
+        # length at the configured speed. Kept as an absolute schedule so
+        # the time spent in mouse.move() is absorbed instead of accumulating
+        num_points = len(path)
+        delays = np.diff(arc_length) / self.speed_px_per_sec * self._rng.uniform(0.8, 1.2, size=num_points - 1)
+        if pause_index is not None:
+            delays[pause_index] += pause
+        schedule = np.cumsum(delays).tolist()
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        # Move along path (tolist() unboxes to plain floats for Playwright)
+        xs = path[:, 0].tolist()
+        ys = path[:, 1].tolist()
+        for i in range(num_points):
+            await page.mouse.move(xs[i], ys[i])
             
-            # Variable delay between points
-            if i < len(path) - 1:
-                delay = (total_time / len(path)) * random.uniform(0.8, 1.2)
-                await asyncio.sleep(delay)
+            if i < num_points - 1:
+                remaining = started + schedule[i] - loop.time()
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
     
     async def click_with_hesitation(
         self,
@@ -165,19 +344,26 @@ class HumanMouseSimulator:
             return
         
         # Move close to target with slight overshoot
-        overshoot_x = x + random.uniform(-5, 5)
-        overshoot_y = y + random.uniform(-5, 5)
-        
-        await self.move_to(page, overshoot_x, overshoot_y)
-        
-        # Small delay (hesitation)
-        await asyncio.sleep(random.uniform(0.05, 0.15))
-        
-        # Correct to exact position
-        await page.mouse.move(x, y)
+        overshoot = (x + self._rng.uniform(-5, 5), y + self._rng.uniform(-5, 5))
+        
+        viewport = page.viewport_size
+        start = (viewport['width'] / 2, viewport['height'] / 2)
+        approach, approach_length = self.generate_human_path(start, overshoot, num_points=40)
+        
+        # Correct to exact position along the same schedule
+        correction = np.linspace(approach[-1], (x, y), 10, dtype=np.float32)
+        path = np.concatenate([approach, correction[1:]])
+        arc_length = np.concatenate([approach_length, approach_length[-1] + _arc_length(correction)[1:]])
+        
+        # Small delay (hesitation) at the overshoot point
+        await self._follow_path(
+            page, path, arc_length,
+            pause_index=len(approach) - 1,
+            pause=self._rng.uniform(0.05, 0.15)
+        )
         
         # Click
-        await page.mouse.click(x, y, button=button, delay=random.randint(50, 150))
+        await page.mouse.click(x, y, button=button, delay=int(self._rng.integers(50, 151)))
         
         logger.debug(f"Human-like click at ({x}, {y})")
 
@@ -194,8 +380,11 @@ class HumanTypingSimulator:
         """Initialize typing simulator."""
         self.config = get_config()
         self.enabled = self.config.get('stealth.human_input.enabled', default=True)
+        self._rng = np.random.default_rng()
         self.delay_min = self.config.get('stealth.human_input.typing_delay_ms_min', default=50)
         self.delay_max = self.config.get('stealth.human_input.typing_delay_ms_max', default=150)
+        # Type in short bursts (one element.type() per chunk) instead of per character
+        self.chunked = self.config.get('stealth.human_input.chunked_typing', default=False)
         
         logger.info(f"Human Typing Simulator: {'Enabled' if self.enabled else 'Disabled'} ({self.delay_min}-{self.delay_max}ms)")
     
@@ -230,20 +419,66 @@ class HumanTypingSimulator:
         # Focus element
         await element.focus()
         
+        if self.chunked:
+            await self._type_chunks(element, text)
+            logger.debug(f"Human-like typed (chunked): '{text[:20]}...' into {selector}")
+            return
+        
+        # Draw every per-character delay up front (3 vectorized calls
+        # instead of ~3 Python PRNG calls per character)
+        n = len(text)
+        delays = self._rng.integers(self.delay_min, self.delay_max + 1, size=n).tolist()
+        punctuation_sleeps = self._rng.uniform(0.1, 0.3, size=n).tolist()
+        thinking_sleeps = np.where(
+            self._rng.random(n) < 0.05,  # 5% chance
+            self._rng.uniform(0.5, 1.5, size=n),
+            0.0
+        ).tolist()
+        
         # Type each character with variable delay
-        for char in text:
-            await element.type(char, delay=random.randint(self.delay_min, self.delay_max))
+        for i, char in enumerate(text):
+            await element.type(char, delay=delays[i])
             
             # Extra delay after punctuation (human behavior)
             if char in '.,!?;:':
-                await asyncio.sleep(random.uniform(0.1, 0.3))
+                await asyncio.sleep(punctuation_sleeps[i])
             
             # Occasional longer pause (thinking)
-            if random.random() < 0.05:  # 5% chance
-                await asyncio.sleep(random.uniform(0.5, 1.5))
+            if thinking_sleeps[i]:
+                await asyncio.sleep(thinking_sleeps[i])
         
         logger.debug(f"Human-like typed: '{text[:20]}...' into {selector}")
     
+    def _split_chunks(self, text: str) -> List[str]:
+        """Split text into 3-6 character bursts at word/punctuation boundaries."""
+        chunks = []
+        for token in _TYPING_CHUNK_RE.findall(text):
+            while len(token) > TYPING_CHUNK_MAX:
+                size = int(self._rng.integers(TYPING_CHUNK_MIN, TYPING_CHUNK_MAX + 1))
+                chunks.append(token[:size])
+                token = token[size:]
+            chunks.append(token)
+        return chunks
+    
+    async def _type_chunks(self, element, text: str):
+        """Type text in short bursts separated by human pauses."""
+        chunks = self._split_chunks(text)
+        n = len(chunks)
+        delays = self._rng.integers(self.delay_min, self.delay_max + 1, size=n).tolist()
+        lengths = np.fromiter((len(chunk) for chunk in chunks), dtype=float, count=n)
+        
+        # Short pause after every burst, plus the occasional thinking pause
+        # at the per-character 5% rate
+        pauses = (self._rng.uniform(0.1, 0.3, size=n) + np.where(
+            self._rng.random(n) < 0.05 * lengths,
+            self._rng.uniform(0.5, 1.5, size=n),
+            0.0
+        )).tolist()
+        
+        for i, chunk in enumerate(chunks):
+            await element.type(chunk, delay=delays[i])
+            await asyncio.sleep(pauses[i])
+    
     async def type_with_mistakes(
         self,
         page: Page,
@@ -263,37 +498,45 @@ class HumanTypingSimulator:
         element = page.locator(selector)
         await element.focus()
         
+        # Precompute typo rolls and delays for the whole string
+        n = len(text)
+        mistakes = (self._rng.random(n) < mistake_rate).tolist()
+        delays = self._rng.integers(self.delay_min, self.delay_max + 1, size=n).tolist()
+        
         for i, char in enumerate(text):
             # Randomly make a typo
-            if random.random() < mistake_rate and i > 0:
+            if mistakes[i] and i > 0:
                 # Type wrong key (adjacent on keyboard)
                 wrong_char = self._get_adjacent_key(char)
-                await element.type(wrong_char, delay=random.randint(self.delay_min, self.delay_max))
+                await element.type(wrong_char, delay=int(self._rng.integers(self.delay_min, self.delay_max + 1)))
                 
                 # Realize mistake (short pause)
-                await asyncio.sleep(random.uniform(0.2, 0.5))
+                await asyncio.sleep(self._rng.uniform(0.2, 0.5))
                 
                 # Backspace
-                await element.press('Backspace', delay=random.randint(50, 100))
+                await element.press('Backspace', delay=int(self._rng.integers(50, 101)))
             
             # Type correct character
-            await element.type(char, delay=random.randint(self.delay_min, self.delay_max))
+            await element.type(char, delay=delays[i])
         
         logger.debug(f"Typed with realistic mistakes: '{text[:20]}...'")
     
     def _get_adjacent_key(self, char: str) -> str:
         """Get an adjacent key on QWERTY keyboard."""
-        keyboard_layout = {
-            'a': 'sq', 'b': 'vgn', 'c': 'xvd', 'd': 'sfc', 'e': 'wr',
-            'f': 'dgv', 'g': 'fht', 'h': 'gjy', 'i': 'uo', 'j': 'hku',
-            'k': 'jli', 'l': 'kp', 'm': 'nj', 'n': 'bmh', 'o': 'ip',
-            'p': 'ol', 'q': 'wa', 'r': 'et', 's': 'adw', 't': 'ry',
-            'u': 'yи', 'v': 'cfb', 'w': 'qse', 'x': 'zcd', 'y': 'tu',
-            'z': 'xs'
-        }
-        
-        adjacent = keyboard_layout.get(char.lower(), char)
-        return random.choice(adjacent) if adjacent else char
+        code = ord(char)
+        adjacent = _ADJACENT_KEYS[code] if code < 128 else None
+        return adjacent[self._rng.integers(len(adjacent))] if adjacent else char
+
+
+# Plays a precomputed scroll schedule: positions in px, pauses in ms
+_SCROLL_ANIMATION_SCRIPT = """
+async ({ positions, pauses }) => {
+    for (let i = 0; i < positions.length; i++) {
+        window.scrollTo(0, positions[i]);
+        await new Promise(resolve => setTimeout(resolve, pauses[i]));
+    }
+}
+"""
 
 
 class HumanScrollSimulator:
@@ -308,6 +551,7 @@ class HumanScrollSimulator:
         """Initialize scroll simulator."""
         self.config = get_config()
         self.enabled = self.config.get('stealth.human_input.enabled', default=True)
+        self._rng = np.random.default_rng()
         
         logger.info(f"Human Scroll Simulator: {'Enabled' if self.enabled else 'Disabled'}")
     
@@ -347,48 +591,34 @@ class HumanScrollSimulator:
         # Number of scroll steps (more for longer distances)
         num_steps = max(5, int(distance / 100))
         
-        # Scroll in increments with variable delays
-        for i in range(num_steps):
-            progress = (i + 1) / num_steps
-            
-            # Ease-in-out curve for smooth motion
-            eased_progress = 0.5 - 0.5 * np.cos(progress * np.pi)
-            
-            scroll_y = current_y + (target_y - current_y) * eased_progress
-            
-            # Add small random offset
-            scroll_y += random.uniform(-10, 10)
-            
-            await page.evaluate(f"window.scrollTo(0, {scroll_y})")
-            
-            # Variable delay
-            await asyncio.sleep(random.uniform(0.05, 0.15))
+        # Ease-in-out curve for smooth motion, with small random offsets
+        progress = np.arange(1, num_steps + 1) / num_steps
+        eased_progress = 0.5 - 0.5 * np.cos(progress * np.pi)
+        positions = current_y + (target_y - current_y) * eased_progress + self._rng.uniform(-10, 10, size=num_steps)
+        pauses_ms = self._rng.uniform(50, 150, size=num_steps)
+        
+        # Scroll in increments with variable delays, animated in the page
+        # so the whole scroll costs one CDP round-trip instead of one per step
+        await page.evaluate(_SCROLL_ANIMATION_SCRIPT, {
+            'positions': positions.tolist(),
+            'pauses': pauses_ms.tolist(),
+        })
         
         logger.debug(f"Human-like scrolled to {selector}")
 
 
-# Singleton instances
-_mouse_simulator = None
-_typing_simulator = None
-_scroll_simulator = None
-
+# Singleton instances (created on first call)
+@functools.cache
 def get_human_mouse() -> HumanMouseSimulator:
     """Get singleton mouse simulator."""
-    global _mouse_simulator
-    if _mouse_simulator is None:
-        _mouse_simulator = HumanMouseSimulator()
-    return _mouse_simulator
+    return HumanMouseSimulator()
 
+@functools.cache
 def get_human_typing() -> HumanTypingSimulator:
     """Get singleton typing simulator."""
-    global _typing_simulator
-    if _typing_simulator is None:
-        _typing_simulator = HumanTypingSimulator()
-    return _typing_simulator
+    return HumanTypingSimulator()
 
+@functools.cache
 def get_human_scroll() -> HumanScrollSimulator:
     """Get singleton scroll simulator."""
-    global _scroll_simulator
-    if _scroll_simulator is None:
-        _scroll_simulator = HumanScrollSimulator()
-    return _scroll_simulator
+    return HumanScrollSimulator()
@@ -11,11 +11,17 @@ Features:
 - Integration with existing proxy system
 """
 
+import functools
 import logging
 from typing import Optional, Dict, Any
-from curl_cffi import requests as curl_requests
+from curl_cffi import CurlMOpt, CurlOpt, requests as curl_requests
 from config_manager import get_config
 
+try:
+    import requests as std_requests
+except ImportError:
+    std_requests = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +39,11 @@ class TLSSpoofingManager:
         self.enabled = self.config.get('stealth.tls.enabled', default=True)
         self.impersonate = self.config.get('stealth.tls.impersonate', default='chrome110')
         
+        # Per-request arguments that never change, resolved from config once
+        self._base_args = {
+            'impersonate': self.impersonate,  # KEY: TLS spoofing
+        }
+        
         logger.info(f"TLS Spoofing initialized: {self.impersonate if self.enabled else 'Disabled'}")
     
     def make_request(
@@ -65,8 +76,9 @@ class TLSSpoofingManager:
         """
         if not self.enabled:
             # Fallback to standard requests
-            import requests
-            return requests.request(
+            if std_requests is None:
+                raise ImportError("TLS spoofing is disabled and 'requests' is not installed")
+            return std_requests.request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -78,16 +90,16 @@ class TLSSpoofingManager:
         
         try:
             # Build request arguments
-            request_args = {
-                'method': method,
-                'url': url,
-                'headers': headers or {},
-                'data': data,
-                'timeout': timeout,
-                'impersonate': self.impersonate,  # KEY: TLS spoofing
-                'proxies': {'http': proxy, 'https': proxy} if proxy else None,
+            request_args = self._base_args.copy()
+            request_args.update(
+                method=method,
+                url=url,
+                headers=headers or {},
+                data=data,
+                timeout=timeout,
+                proxies={'http': proxy, 'https': proxy} if proxy else None,
                 **kwargs
-            }
+            )
             
             # Make request with Chrome TLS signature
             response = curl_requests.request(**request_args)
@@ -139,40 +151,75 @@ class TLSSessionManager:
     
     Reuses TCP connections to reduce handshake overhead and
     maintain consistent fingerprints across multiple requests.
+    
+    Requests go through a curl_cffi AsyncSession, so concurrent scrapes share
+    one libcurl multi handle on the event loop instead of blocking it. A sync
+    session is created on first use for callers outside asyncio.
     """
     
     def __init__(self):
         """Initialize session manager."""
         self.config = get_config()
-        self.session = curl_requests.Session()
-        self.session.impersonate = self.config.get('stealth.tls.impersonate', default='chrome110')
+        self.session_args = {
+            'impersonate': self.config.get('stealth.tls.impersonate', default='chrome110'),
+            'timeout': self.config.get('scraper.timeouts.page_load', default=30),
+            'max_redirects': self.config.get('stealth.tls.max_redirects', default=5),
+            # Wait for an existing HTTP/2 connection to multiplex onto
+            # instead of opening a new TCP+TLS connection per request
+            'curl_options': {CurlOpt.PIPEWAIT: 1},
+        }
+        self.max_clients = self.config.get('stealth.tls.max_clients', default=64)
+        self.max_host_connections = self.config.get('stealth.tls.max_host_connections', default=6)
         
-        # Configure session settings
-        self.session.timeout = self.config.get('scraper.timeouts.page_load', default=30)
-        self.session.max_redirects = self.config.get('stealth.tls.max_redirects', default=5)
+        self.session = curl_requests.AsyncSession(max_clients=self.max_clients, **self.session_args)
+        self._multi_configured = False
+        self._sync_session: Optional[curl_requests.Session] = None
         
-        logger.info("TLS Session Manager initialized with connection pooling")
+        logger.info(f"TLS Session Manager initialized with connection pooling (max_clients={self.max_clients})")
     
-    def get(self, url: str, **kwargs) -> curl_requests.Response:
+    @property
+    def sync_session(self) -> curl_requests.Session:
+        """Blocking session for callers that are not running under asyncio."""
+        if self._sync_session is None:
+            self._sync_session = curl_requests.Session(**self.session_args)
+        return self._sync_session
+    
+    def _configure_multi(self):
+        """Cap connections per host on the multi handle (created on first use)."""
+        self.session.acurl.setopt(CurlMOpt.MAX_HOST_CONNECTIONS, self.max_host_connections)
+        self._multi_configured = True
+    
+    async def get(self, url: str, **kwargs) -> curl_requests.Response:
         """Make GET request using persistent session."""
-        return self.session.get(url, **kwargs)
+        if not self._multi_configured:
+            self._configure_multi()
+        return await self.session.get(url, **kwargs)
     
-    def post(self, url: str, **kwargs) -> curl_requests.Response:
+    async def post(self, url: str, **kwargs) -> curl_requests.Response:
         """Make POST request using persistent session."""
-        return self.session.post(url, **kwargs)
+        if not self._multi_configured:
+            self._configure_multi()
+        return await self.session.post(url, **kwargs)
+    
+    def get_sync(self, url: str, **kwargs) -> curl_requests.Response:
+        """Make blocking GET request using the sync session."""
+        return self.sync_session.get(url, **kwargs)
     
-    def close(self):
-        """Close session and release connections."""
-        self.session.close()
+    def post_sync(self, url: str, **kwargs) -> curl_requests.Response:
+        """Make blocking POST request using the sync session."""
+        return self.sync_session.post(url, **kwargs)
+    
+    async def close(self):
+        """Close sessions and release connections."""
+        await self.session.close()
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
         logger.debug("TLS session closed")
 
 
-# Singleton instance
-_tls_manager = None
-
+# Singleton instance (created on first call)
+@functools.cache
 def get_tls_manager() -> TLSSpoofingManager:
     """Get singleton TLS spoofing manager instance."""
-    global _tls_manager
-    if _tls_manager is None:
-        _tls_manager = TLSSpoofingManager()
-    return _tls_manager
+    return TLSSpoofingManager()
@@ -1,6 +1,7 @@
 """Unit tests for concurrent engine."""
 import pytest
 import asyncio
+import time
 from concurrent_engine import DomainRateLimiter, CircuitBreaker, ConcurrentProcessor
 
 
@@ -14,10 +15,10 @@ class TestDomainRateLimiter:
         
         url = "https://example.com/page1"
         
-        start = asyncio.get_event_loop().time()
+        start = time.monotonic()
         await limiter.acquire(url)
         await limiter.acquire(url)
-        elapsed = asyncio.get_event_loop().time() - start
+        elapsed = time.monotonic() - start
         
         assert elapsed >= 0.5, "Should enforce 0.5s delay"
     
@@ -29,10 +30,10 @@ class TestDomainRateLimiter:
         url1 = "https://example1.com/page"
         url2 = "https://example2.com/page"
         
-        start = asyncio.get_event_loop().time()
+        start = time.monotonic()
         await limiter.acquire(url1)
         await limiter.acquire(url2)
-        elapsed = asyncio.get_event_loop().time() - start
+        elapsed = time.monotonic() - start
         
         assert elapsed < 0.5, "Different domains should be parallel"
 
@@ -81,9 +82,9 @@ class TestConcurrentProcessor:
         
         tasks = [(i, f"url{i}", i) for i in range(5)]
         
-        start = asyncio.get_event_loop().time()
+        start = time.monotonic()
         results = await processor.process_batch(tasks, dummy_worker)
-        elapsed = asyncio.get_event_loop().time() - start
+        elapsed = time.monotonic() - start
         
         assert len(results) == 5
         # With 3 workers and 5 tasks, should take ~0.2s not 0.5s
@@ -20,7 +20,14 @@ class TestJSONLDExtractor:
         
         offer2 = {'price': 129000}
         assert JSONLDExtractor._extract_price(offer2) == 129000.0
-    
+
+    def test_extract_price_formatted_strings(self):
+        """Test prices with separators, currency text and garbage."""
+        assert JSONLDExtractor._extract_price({'price': '129,000'}) == 129000.0
+        assert JSONLDExtractor._extract_price({'price': '129,000 IRR'}) == 129000.0
+        assert JSONLDExtractor._extract_price({'price': '$12.50'}) == 12.5
+        assert JSONLDExtractor._extract_price({'price': 'N/A'}) == 0.0
+
     def test_extract_product_data_simple(self):
         """Test product data extraction."""
         schema = {
@@ -0,0 +1,164 @@
+"""Unit tests for sitemap streaming, index recursion and conditional caching."""
+import asyncio
+import gzip
+import os
+import shelve
+import pytest
+from datetime import datetime
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import sitemap_parser
+from sitemap_parser import SitemapCache, SitemapParser
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+PRODUCT_LOCS = [
+    'https://shop.example.com/product/1',
+    'https://shop.example.com/product/2',
+    'https://shop.example.com/product/3',
+]
+
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture(params=['lxml', 'etree'])
+def backend(request, monkeypatch):
+    """Run the test once per XML backend."""
+    if request.param == 'lxml':
+        if not sitemap_parser.HAS_LXML:
+            pytest.skip("lxml not installed")
+    else:
+        monkeypatch.setattr(sitemap_parser, 'HAS_LXML', False)
+        for name in ('loc', 'lastmod', 'changefreq', 'priority'):
+            monkeypatch.setattr(
+                sitemap_parser, f'_{name.upper()}', sitemap_parser._compile_child_text(name)
+            )
+    return request.param
+
+
+@pytest.fixture
+async def sitemap_server():
+    """Serve the sitemap fixtures; server.hits counts requests per path."""
+    urlset = _read_fixture('sitemap.xml')
+    hits = {}
+
+    async def handle_urlset(request):
+        hits[request.path] = hits.get(request.path, 0) + 1
+        if request.headers.get('If-None-Match') == '"v1"':
+            hits['not_modified'] = hits.get('not_modified', 0) + 1
+            return web.Response(status=304)
+        return web.Response(body=urlset, content_type='application/xml', headers={'ETag': '"v1"'})
+
+    async def handle_gzip(request):
+        hits[request.path] = hits.get(request.path, 0) + 1
+        return web.Response(body=gzip.compress(urlset), content_type='application/x-gzip')
+
+    async def handle_index(request):
+        hits[request.path] = hits.get(request.path, 0) + 1
+        base = str(server.make_url('')).rstrip('/')
+        body = _read_fixture('sitemap_index.xml').decode().replace('{base}', base)
+        return web.Response(text=body, content_type='application/xml')
+
+    app = web.Application()
+    app.router.add_get('/sitemap.xml', handle_urlset)
+    app.router.add_get('/sitemap.xml.gz', handle_gzip)
+    app.router.add_get('/sitemap_index.xml', handle_index)
+
+    server = TestServer(app)
+    await server.start_server()
+    server.hits = hits
+    yield server
+    await server.close()
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    """Keep tests from touching a shelve file unless they opt in."""
+    monkeypatch.setattr(SitemapParser, 'cache', None)
+
+
+class TestStreamSitemap:
+    """Test streaming parse on both XML backends."""
+
+    async def test_stream_urlset(self, backend, sitemap_server):
+        """Test URLs and their fields are streamed from a plain urlset."""
+        urls = await SitemapParser.get_all_urls(str(sitemap_server.make_url('/sitemap.xml')))
+
+        assert [u.loc for u in urls] == PRODUCT_LOCS
+        assert urls[0].lastmod == datetime(2024, 1, 15)
+        assert urls[0].changefreq == 'daily'
+        assert urls[0].priority == 0.8
+        assert urls[1].lastmod.utcoffset().total_seconds() == 3.5 * 3600
+        assert urls[2].lastmod is None
+        assert urls[2].priority == 0.5
+
+    async def test_stream_gzip(self, backend, sitemap_server):
+        """Test a gzip-compressed body is detected and decompressed."""
+        urls = await SitemapParser.get_all_urls(str(sitemap_server.make_url('/sitemap.xml.gz')))
+
+        assert [u.loc for u in urls] == PRODUCT_LOCS
+
+    async def test_sitemap_index(self, backend, sitemap_server):
+        """Test children of a sitemap index are fetched and merged."""
+        urls = await SitemapParser.get_all_urls(str(sitemap_server.make_url('/sitemap_index.xml')))
+
+        assert len(urls) == 6
+        assert sorted({u.loc for u in urls}) == PRODUCT_LOCS
+        assert sitemap_server.hits == {
+            '/sitemap_index.xml': 1, '/sitemap.xml': 1, '/sitemap.xml.gz': 1
+        }
+
+    async def test_concurrent_get_all_urls(self, backend, sitemap_server):
+        """Test parallel crawls do not share parser state."""
+        index_url = str(sitemap_server.make_url('/sitemap_index.xml'))
+
+        results = await asyncio.gather(*[SitemapParser.get_all_urls(index_url) for _ in range(8)])
+
+        for urls in results:
+            assert sorted(u.loc for u in urls) == sorted(PRODUCT_LOCS * 2)
+
+
+class TestSitemapCache:
+    """Test conditional-request caching."""
+
+    async def test_not_modified_reuses_cached_urls(self, sitemap_server, tmp_path, monkeypatch):
+        """Test a 304 answer returns the URLs parsed on the first fetch."""
+        monkeypatch.setattr(SitemapParser, 'cache', SitemapCache(str(tmp_path / 'cache')))
+        url = str(sitemap_server.make_url('/sitemap.xml'))
+
+        first = await SitemapParser.get_all_urls(url)
+        second = await SitemapParser.get_all_urls(url)
+
+        assert [u.loc for u in second] == [u.loc for u in first] == PRODUCT_LOCS
+        assert sitemap_server.hits['not_modified'] == 1
+        assert SitemapParser.cache.get_validators(url) == {'etag': '"v1"', 'last_modified': None}
+
+    async def test_not_modified_without_result_refetches(self, sitemap_server, tmp_path, monkeypatch):
+        """Test a 304 with no stored result drops the validators and refetches."""
+        cache = SitemapCache(str(tmp_path / 'cache'))
+        monkeypatch.setattr(SitemapParser, 'cache', cache)
+        url = str(sitemap_server.make_url('/sitemap.xml'))
+        await SitemapParser.get_all_urls(url)
+        with shelve.open(cache.path) as db:
+            del db[f'result:{url}']
+
+        urls = await SitemapParser.get_all_urls(url)
+
+        assert [u.loc for u in urls] == PRODUCT_LOCS
+        assert sitemap_server.hits['not_modified'] == 1
+        assert sitemap_server.hits['/sitemap.xml'] == 3
+        assert cache.get_result(url) is not None
+
+    def test_conditional_headers(self):
+        """Test validators map onto conditional request headers."""
+        assert SitemapCache.conditional_headers(None) == {}
+        assert SitemapCache.conditional_headers(
+            {'etag': '"abc"', 'last_modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+        ) == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        }
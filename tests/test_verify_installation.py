@@ -0,0 +1,142 @@
+"""Unit tests for the pre-flight check runner (verify_installation.py)."""
+import asyncio
+import importlib
+import json
+import sys
+import time
+import pytest
+
+import verify_installation
+from verify_installation import PreFlightChecker, SKIPPED, parse_args, select_checks
+
+
+def check_alpha():
+    return True, "alpha ok"
+
+
+def check_beta():
+    return False, "beta missing"
+
+
+async def check_gamma():
+    return True, "gamma ok"
+
+
+@pytest.fixture
+def checker():
+    """Checker with progress output suppressed."""
+    return PreFlightChecker(json_output=True, budget=5.0)
+
+
+class TestRunAll:
+    """Test concurrent execution, dependencies and the shared budget."""
+
+    def test_results_recorded_by_severity(self, checker):
+        """Test passes, critical failures and warnings are filed separately."""
+        checker.run_all([
+            ("alpha", check_alpha, True, ()),
+            ("beta critical", check_beta, True, ()),
+            ("beta optional", check_beta, False, ()),
+            ("gamma", check_gamma, False, ()),
+        ])
+
+        assert checker.passed == ["alpha", "gamma"]
+        assert checker.critical_failures == [("beta critical", "beta missing")]
+        assert checker.warnings == [("beta optional", "beta missing")]
+        assert checker.exit_code == 1
+
+    def test_dependency_failure_skips_check(self, checker):
+        """Test a check is skipped without running when its dependency fails."""
+        calls = []
+
+        def check_dependent():
+            calls.append(True)
+            return True, "ran"
+
+        checker.run_all([
+            ("beta", check_beta, True, ()),
+            ("dependent", check_dependent, True, ("beta",)),
+        ])
+
+        assert calls == []
+        assert checker.skipped == [("dependent", "skipped (beta failed)")]
+        assert checker._results["dependent"][0] is SKIPPED
+
+    def test_budget_overrun_reported(self, checker):
+        """Test checks still running when the budget runs out are reported as failed."""
+        async def check_slow():
+            await asyncio.sleep(10)
+            return True, "never"
+
+        checker.budget = 0.2
+        started = time.monotonic()
+        checker.run_all([
+            ("slow", check_slow, True, ()),
+            ("alpha", check_alpha, False, ()),
+        ])
+
+        assert time.monotonic() - started < 2
+        assert checker.critical_failures == [("slow", "pre-flight budget of 0.2s exhausted")]
+        assert checker.passed == ["alpha"]
+
+    def test_exception_keeps_check_severity(self, checker):
+        """Test a raising check is a warning when optional and a failure when critical."""
+        def check_broken():
+            raise RuntimeError("boom")
+
+        checker.run_all([
+            ("optional", check_broken, False, ()),
+            ("critical", check_broken, True, ()),
+        ])
+
+        assert checker.warnings == [("optional", "boom")]
+        assert checker.critical_failures == [("critical", "boom")]
+
+
+class TestCommandLine:
+    """Test check selection and machine-readable output."""
+
+    def test_only_and_fast_selection(self):
+        """Test --only keeps the named checks and --fast drops slow host probes."""
+        only = select_checks(parse_args(['--only', 'disk_space', 'python_version']))
+        assert [check[0] for check in only] == ["Disk space >= 10GB", "Python version >= 3.11"]
+
+        fast_keys = {check[1].__name__ for check in select_checks(parse_args(['--fast']))}
+        assert 'check_disk_space' not in fast_keys
+        assert 'check_env_variables' in fast_keys
+
+    def test_json_output_shape(self, monkeypatch, capsys):
+        """Test --json prints one compact summary object and exits with its code."""
+        monkeypatch.setattr(verify_installation, 'CHECKS', [
+            ("alpha", check_alpha, True, ()),
+            ("beta", check_beta, False, ()),
+            ("gamma", check_gamma, False, ("beta",)),
+        ])
+
+        with pytest.raises(SystemExit) as exc_info:
+            verify_installation.main(['--json', '--only', 'alpha', 'beta', 'gamma'])
+
+        output = capsys.readouterr().out.strip()
+        summary = json.loads(output)
+        assert '\n' not in output
+        assert summary == {
+            'passed': ["alpha"],
+            'warnings': [{'name': "beta", 'message': "beta missing"}],
+            'skipped': [{'name': "gamma", 'message': "skipped (beta failed)"}],
+            'failures': [],
+            'exit': 2,
+        }
+        assert exc_info.value.code == 2
+
+    def test_no_color_disables_ansi(self, monkeypatch):
+        """Test NO_COLOR drops ANSI codes even on a terminal."""
+        monkeypatch.setattr(sys.stdout, 'isatty', lambda: True, raising=False)
+        try:
+            monkeypatch.delenv('NO_COLOR', raising=False)
+            assert importlib.reload(verify_installation).GREEN == '\033[92m'
+
+            monkeypatch.setenv('NO_COLOR', '1')
+            assert importlib.reload(verify_installation).GREEN == ''
+        finally:
+            monkeypatch.undo()
+            importlib.reload(verify_installation)
@@ -0,0 +1,65 @@
+"""
+URL Utilities
+
+Memoized URL helpers shared by deduplication, circuit breaking and
+throttling, which all look at the same URLs many times per crawl.
+"""
+
+from functools import lru_cache
+from urllib.parse import urlparse, urlunparse
+
+# Query parameters that never change page content
+TRACKING_PARAMS = frozenset({
+    'utm_source', 'utm_medium', 'utm_campaign', 'fbclid', 'gclid', 'ref', 'source'
+})
+
+# Bounded so long crawls don't grow the caches forever
+NORMALIZE_CACHE_SIZE = 16384
+DOMAIN_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_url(url: str) -> str:
+    """
+    Normalize URL for comparison.
+    
+    - Remove trailing slashes
+    - Sort query parameters
+    - Lowercase scheme and domain
+    - Remove common tracking parameters
+    """
+    parsed = urlparse(url)
+    
+    # Normalize scheme and netloc
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    
+    # Remove trailing slash from path
+    path = parsed.path.rstrip('/')
+    if not path:
+        path = '/'
+    
+    # Drop tracking parameters and sort the rest, keeping the original
+    # encoding of each pair
+    sorted_query = ''
+    if parsed.query:
+        sorted_query = '&'.join(sorted(
+            pair for pair in parsed.query.split('&')
+            if pair and pair.split('=', 1)[0] not in TRACKING_PARAMS
+        ))
+    
+    # Rebuild URL
+    return urlunparse((
+        scheme,
+        netloc,
+        path,
+        '',  # params (rarely used)
+        sorted_query,
+        ''   # fragment (ignore)
+    ))
+
+
+@lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def domain_of(url: str) -> str:
+    """Lowercased network location (host[:port]) of a URL."""
+    return urlparse(url).netloc.lower()
@@ -6,8 +6,11 @@ to avoid browser fingerprinting detection.
 """
 
 import random
+import re
 import logging
-from typing import Dict, List
+from collections import deque
+from types import MappingProxyType
+from typing import List, Mapping
 
 logger = logging.getLogger("UserAgentPool")
 
@@ -69,6 +72,25 @@ BROWSER_HEADERS = {
     }
 }
 
+# Random pool indices drawn per batch (one PRNG call per batch)
+UA_INDEX_BATCH = 4096
+
+# Any of these tokens marks a mobile User-Agent
+_MOBILE_RE = re.compile(r'Mobile|Android|iPhone|iPad')
+
+
+def _classify_browser(ua: str) -> str:
+    """Browser family of a User-Agent ("chrome", "firefox" or "safari")."""
+    if "Firefox" in ua:
+        return "firefox"
+    if "Safari" in ua and "Chrome" not in ua:
+        return "safari"
+    return "chrome"
+
+
+# Built-in UAs are classified once at import
+_UA_BROWSER = {ua: _classify_browser(ua) for ua in USER_AGENTS}
+
 
 class UserAgentPool:
     """Manages User-Agent rotation with appropriate headers."""
@@ -81,12 +103,31 @@ class UserAgentPool:
             user_agents: Optional custom UA list
         """
         self.user_agents = user_agents or USER_AGENTS
+        # Browser family per UA, parallel to user_agents
+        self.browser_types = [_UA_BROWSER.get(ua) or _classify_browser(ua) for ua in self.user_agents]
+        # Fully assembled, read-only header set per UA
+        self._ua_headers = [
+            MappingProxyType({
+                "user-agent": ua,
+                "accept-language": "en-US,en;q=0.9,fa;q=0.8",
+                # Add browser-specific headers
+                **BROWSER_HEADERS.get(browser_type, {}),
+            })
+            for ua, browser_type in zip(self.user_agents, self.browser_types)
+        ]
         self.current_index = 0
+        self._random_indices = deque()
         logger.info(f"Initialized UA pool with {len(self.user_agents)} agents")
     
+    def _next_random_index(self) -> int:
+        """Pop a pre-sampled random index, refilling the batch when empty."""
+        if not self._random_indices:
+            self._random_indices.extend(random.choices(range(len(self.user_agents)), k=UA_INDEX_BATCH))
+        return self._random_indices.popleft()
+    
     def get_random(self) -> str:
         """Get a random User-Agent."""
-        return random.choice(self.user_agents)
+        return self.user_agents[self._next_random_index()]
     
     def get_next(self) -> str:
         """Get next User-Agent in rotation."""
@@ -94,36 +135,19 @@ class UserAgentPool:
         self.current_index = (self.current_index + 1) % len(self.user_agents)
         return ua
     
-    def get_with_headers(self) -> Dict[str, str]:
+    def get_with_headers(self) -> Mapping[str, str]:
         """
         Get User-Agent with appropriate browser headers.
         
         Returns:
-            Dict with 'user-agent' and browser-specific headers
+            Read-only mapping with 'user-agent' and browser-specific headers
+            (copy it with dict() before modifying)
         """
-        ua = self.get_random()
-        
-        # Detect browser type
-        if "Firefox" in ua:
-            browser_type = "firefox"
-        elif "Safari" in ua and "Chrome" not in ua:
-            browser_type = "safari"
-        else:
-            browser_type = "chrome"
-        
-        headers = {
-            "user-agent": ua,
-            "accept-language": "en-US,en;q=0.9,fa;q=0.8",
-        }
-        
-        # Add browser-specific headers
-        headers.update(BROWSER_HEADERS.get(browser_type, {}))
-        
-        logger.debug(f"Generated headers for {browser_type}")
-        return headers
+        index = self._next_random_index()
+        logger.debug(f"Generated headers for {self.browser_types[index]}")
+        return self._ua_headers[index]
     
     @staticmethod
     def is_mobile(ua: str) -> bool:
         """Check if User-Agent is mobile."""
-        mobile_indicators = ["Mobile", "Android", "iPhone", "iPad"]
-        return any(indicator in ua for indicator in mobile_indicators)
+        return _MOBILE_RE.search(ua) is not None
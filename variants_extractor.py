@@ -5,31 +5,64 @@ Extracts all product variants (colors, sizes, SKUs) from e-commerce pages.
 Uses both JSON-LD and interactive DOM manipulation.
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
 from playwright.async_api import Page
 
 logger = logging.getLogger("VariantsExtractor")
 
+# Common variant selectors
+VARIANT_SELECTORS = (
+    'button[data-variant]',
+    '.product-variant',
+    '.color-swatch',
+    '.size-option',
+    'select[data-variant-selector]',
+    '[class*="variant"]',
+)
 
+
+def _classify_selector(selector: str) -> str:
+    """Variant type implied by a selector ("color", "size" or "variant")."""
+    return "color" if "color" in selector else "size" if "size" in selector else "variant"
+
+
+# One union selector so the browser matches the page once
+_COMBINED_SELECTOR = ', '.join(VARIANT_SELECTORS)
+
+# [type, union of that type's selectors] in priority order; elements that
+# match none of them are plain "variant"s
+_TYPED_SELECTORS = [
+    [variant_type, ', '.join(sel for sel in VARIANT_SELECTORS if _classify_selector(sel) == variant_type)]
+    for variant_type in ('color', 'size')
+    if any(_classify_selector(sel) == variant_type for sel in VARIANT_SELECTORS)
+]
+
+# Returns [{type, text, value}] for every element matching the union selector
+_READ_VARIANT_ELEMENTS_SCRIPT = """
+({ combined, typed }) => Array.from(document.querySelectorAll(combined), el => {
+    const match = typed.find(([, selector]) => el.matches(selector));
+    return {
+        type: match ? match[0] : 'variant',
+        text: el.innerText || '',
+        value: el.getAttribute('data-value'),
+    };
+})
+"""
+
+
+@dataclass(slots=True)
 class ProductVariant:
     """Represents a single product variant."""
     
-    def __init__(
-        self,
-        variant_type: str,  # "color", "size", "material"
-        variant_value: str,  # "Red", "XL", "Cotton"
-        price: Optional[int] = None,
-        availability: str = "Unknown",
-        sku: Optional[str] = None,
-        url: Optional[str] = None
-    ):
-        self.variant_type = variant_type
-        self.variant_value = variant_value
-        self.price = price
-        self.availability = availability
-        self.sku = sku
-        self.url = url
+    variant_type: str  # "color", "size", "material"
+    variant_value: str  # "Red", "XL", "Cotton"
+    price: Optional[int] = None
+    availability: str = "Unknown"
+    sku: Optional[str] = None
+    url: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -102,46 +135,23 @@ class VariantsExtractor:
         - Size buttons/dropdowns
         - Variant selectors
         """
-        variants = []
+        # Read every matching element in one round-trip to the browser,
+        # typed by the most specific selector it matches; failures surface
+        # once per page instead of once per element
+        try:
+            rows = await page.evaluate(_READ_VARIANT_ELEMENTS_SCRIPT, {
+                'combined': _COMBINED_SELECTOR,
+                'typed': _TYPED_SELECTORS,
+            })
+        except Exception as e:
+            logger.debug(f"DOM variant read failed: {e}")
+            return []
         
-        # Common variant selectors
-        variant_selectors = [
-            'button[data-variant]',
-            '.product-variant',
-            '.color-swatch',
-            '.size-option',
-            'select[data-variant-selector]',
-            '[class*="variant"]',
+        return [
+            ProductVariant(variant_type=row['type'], variant_value=variant_value)
+            for row in rows
+            if (variant_value := row['value'] or row['text'].strip())
         ]
-        
-        for selector in variant_selectors:
-            try:
-                elements = await page.locator(selector).all()
-                
-                for el in elements:
-                    try:
-                        # Get variant info from element
-                        text = await el.inner_text()
-                        data_variant = await el.get_attribute('data-variant')
-                        data_value = await el.get_attribute('data-value')
-                        
-                        variant_value = data_value or text.strip()
-                        
-                        if variant_value:
-                            # Determine type based on selector
-                            variant_type = "color" if "color" in selector else "size" if "size" in selector else "variant"
-                            
-                            variant = ProductVariant(
-                                variant_type=variant_type,
-                                variant_value=variant_value
-                            )
-                            variants.append(variant)
-                    except:
-                        continue
-            except:
-                continue
-        
-        return variants
     
     @staticmethod
     async def extract_all(page: Page, jsonld_data: Optional[Dict[str, Any]] = None) -> List[ProductVariant]:
@@ -155,33 +165,30 @@ class VariantsExtractor:
         Returns:
             List of ProductVariant objects
         """
-        all_variants = []
+        unique_variants = []
+        seen = set()
         
-        # Try JSON-LD first
+        # Run JSON-LD (CPU only) alongside DOM extraction (browser I/O);
+        # JSON-LD results stay first
+        sources = []
         if jsonld_data:
-            try:
-                jsonld_variants = await VariantsExtractor.extract_from_jsonld(jsonld_data)
-                all_variants.extend(jsonld_variants)
-                logger.info(f"Extracted {len(jsonld_variants)} variants from JSON-LD")
-            except Exception as e:
-                logger.debug(f"JSON-LD variant extraction failed: {e}")
+            sources.append(('JSON-LD', VariantsExtractor.extract_from_jsonld(jsonld_data)))
+        sources.append(('DOM', VariantsExtractor.extract_from_dom(page)))
         
-        # Try DOM extraction
-        try:
-            dom_variants = await VariantsExtractor.extract_from_dom(page)
-            all_variants.extend(dom_variants)
-            logger.info(f"Extracted {len(dom_variants)} variants from DOM")
-        except Exception as e:
-            logger.debug(f"DOM variant extraction failed: {e}")
+        results = await asyncio.gather(*(coro for _, coro in sources), return_exceptions=True)
         
-        # Deduplicate
-        unique_variants = []
-        seen = set()
-        for var in all_variants:
-            key = (var.variant_type, var.variant_value)
-            if key not in seen:
-                seen.add(key)
-                unique_variants.append(var)
+        for (source, _), result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.debug(f"{source} variant extraction failed: {result}")
+                continue
+            logger.info(f"Extracted {len(result)} variants from {source}")
+            
+            # Deduplicate while merging
+            for var in result:
+                key = (var.variant_type, var.variant_value)
+                if key not in seen:
+                    seen.add(key)
+                    unique_variants.append(var)
         
         logger.info(f"Total unique variants: {len(unique_variants)}")
         return unique_variants